@@ -7,6 +7,9 @@ Runs all necessary steps to generate outputs for presentation
 import sys
 import os
 import logging
+from functools import lru_cache
+from importlib import import_module
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add src to path
@@ -20,29 +23,77 @@ logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent
 
+# Project directories and files, resolved once at import time
+DATA_CLEANED = PROJECT_ROOT / "data" / "cleaned"
+DATA_COMBINED = PROJECT_ROOT / "data" / "combined"
+DOCS_DIR = PROJECT_ROOT / "docs"
+VISUALIZATIONS_DIR = PROJECT_ROOT / "visualizations"
+COMBINED_DATA_CSV = DATA_COMBINED / "combined_data.csv"
+
+# Pipeline steps as (step name, module path, description), interned once so
+# sys.modules and cache lookups compare by identity
+_STEPS = tuple(
+    (sys.intern(name), sys.intern(module_path), description)
+    for name, module_path, description in (
+        ("Sentiment Analysis", "sentiment.sentiment_analyzer",
+         "Analyze tweet sentiment using VADER and TextBlob"),
+        ("Aggregate Sentiment", "sentiment.aggregate_sentiment",
+         "Aggregate sentiment scores by day"),
+        ("Integrate Data", "sentiment.integrate_data",
+         "Combine sentiment, CTA, and 311 data"),
+        ("Correlation Analysis", "visualization.correlation_analysis",
+         "Calculate correlations between metrics"),
+        ("Generate Visualizations", "visualization.visualizations",
+         "Create charts and save to visualizations/")
+    )
+)
+
+@lru_cache(maxsize=None)
+def _cached_main(module_path):
+    """Import a pipeline module once and return its main(), or None"""
+    module = sys.modules.get(module_path) or import_module(module_path)
+    return getattr(module, 'main', None)
+
+@lru_cache(maxsize=None)
+def _module_available(module_path):
+    """Check that a pipeline module exists without executing it"""
+    try:
+        return find_spec(module_path) is not None
+    except ModuleNotFoundError:
+        # Parent package is missing
+        return False
+
+def _scan_dir(directory):
+    """Return {name: os.DirEntry} for a directory, or None if it doesn't exist"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: entry for entry in entries}
+    except FileNotFoundError:
+        return None
+
 def check_dependencies():
     """Check if required data files exist"""
     logger.info("Checking dependencies...")
     
-    required_files = [
-        PROJECT_ROOT / "data" / "cleaned" / "tweets.csv",
-        PROJECT_ROOT / "data" / "cleaned" / "cta_ridership.csv",
-        PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
-    ]
+    required_files = ["tweets.csv", "cta_ridership.csv", "311_data.csv"]
     
+    # One directory read instead of a stat call per file
+    present = _scan_dir(DATA_CLEANED) or {}
     missing = []
-    for file in required_files:
-        if not file.exists():
-            missing.append(str(file))
+    for name in required_files:
+        # clean_data writes Parquet; sample data generators still write CSV
+        parquet_name = Path(name).with_suffix(".parquet").name
+        if parquet_name in present:
+            logger.info("✓ Found: %s", parquet_name)
+        elif name not in present:
+            missing.append(str(DATA_CLEANED / name))
         else:
-            logger.info(f"✓ Found: {file.name}")
+            logger.info("✓ Found: %s", name)
     
     if missing:
-        logger.warning(f"Missing files: {missing}")
+        logger.warning("Missing files: %s", missing)
         # Check if we can generate tweets
-        if PROJECT_ROOT / "data" / "cleaned" / "tweets.csv" not in [Path(f) for f in missing]:
-            pass  # Tweets exist
-        else:
+        if "tweets.csv" not in present:
             logger.info("\n💡 Tip: You can generate sample CTA tweets using:")
             logger.info("   python src/data_collection/generate_cta_tweets.py")
         logger.warning("You may need to run data collection first")
@@ -52,25 +103,28 @@ def check_dependencies():
 
 def run_step(step_name, module_path, description=""):
     """Run a pipeline step"""
-    logger.info(f"\n{'='*60}")
-    logger.info(f"Step: {step_name}")
+    info = logger.info
+    info("\n" + "="*60)
+    info("Step: %s", step_name)
     if description:
-        logger.info(f"Description: {description}")
-    logger.info(f"{'='*60}")
+        info("Description: %s", description)
+    info("="*60)
+    
+    if not _module_available(module_path):
+        logger.warning("Module %s not found - skipping", module_path)
+        return False
     
     try:
-        module = __import__(module_path, fromlist=['main'])
-        if hasattr(module, 'main'):
-            module.main()
-            logger.info(f"✓ {step_name} completed successfully")
+        step_main = _cached_main(module_path)
+        if step_main is not None:
+            step_main()
+            info("✓ %s completed successfully", step_name)
             return True
         else:
-            logger.warning(f"Module {module_path} has no main() function")
+            logger.warning("Module %s has no main() function", module_path)
             return False
     except Exception as e:
-        logger.error(f"✗ Error in {step_name}: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.error("✗ Error in %s: %s", step_name, e, exc_info=True)
         return False
 
 def main():
@@ -84,21 +138,8 @@ def main():
         logger.warning("\nSome required files are missing.")
         logger.warning("Attempting to continue anyway...\n")
     
-    steps = [
-        ("Sentiment Analysis", "sentiment.sentiment_analyzer", 
-         "Analyze tweet sentiment using VADER and TextBlob"),
-        ("Aggregate Sentiment", "sentiment.aggregate_sentiment",
-         "Aggregate sentiment scores by day"),
-        ("Integrate Data", "sentiment.integrate_data",
-         "Combine sentiment, CTA, and 311 data"),
-        ("Correlation Analysis", "visualization.correlation_analysis",
-         "Calculate correlations between metrics"),
-        ("Generate Visualizations", "visualization.visualizations",
-         "Create charts and save to visualizations/")
-    ]
-    
     results = []
-    for step_name, module_path, description in steps:
+    for step_name, module_path, description in _STEPS:
         success = run_step(step_name, module_path, description)
         results.append((step_name, success))
     
@@ -109,7 +150,7 @@ def main():
     
     for step_name, success in results:
         status = "✓ SUCCESS" if success else "✗ FAILED"
-        logger.info(f"{status}: {step_name}")
+        logger.info("%s: %s", status, step_name)
     
     # Check outputs
     logger.info("\n" + "="*60)
@@ -117,31 +158,35 @@ def main():
     logger.info("="*60)
     
     output_files = [
-        (PROJECT_ROOT / "data" / "cleaned" / "tweets_with_sentiment.csv", 
+        (DATA_CLEANED / "tweets_with_sentiment.csv",
          "Tweets with sentiment scores"),
-        (PROJECT_ROOT / "data" / "combined" / "daily_sentiment.csv",
+        (DATA_COMBINED / "daily_sentiment.csv",
          "Daily sentiment aggregation"),
-        (PROJECT_ROOT / "data" / "combined" / "combined_data.csv",
+        (COMBINED_DATA_CSV,
          "Combined dataset (REQUIRED for dashboard)"),
-        (PROJECT_ROOT / "docs" / "correlation_report.txt",
+        (DOCS_DIR / "correlation_report.txt",
          "Correlation analysis report"),
     ]
     
+    dir_entries = {}
     for file_path, description in output_files:
-        if file_path.exists():
-            size = file_path.stat().st_size
-            logger.info(f"✓ {description}: {file_path.name} ({size:,} bytes)")
+        # Scan each output directory once and reuse its entries
+        if file_path.parent not in dir_entries:
+            dir_entries[file_path.parent] = _scan_dir(file_path.parent) or {}
+        entry = dir_entries[file_path.parent].get(file_path.name)
+        if entry is not None:
+            size = entry.stat().st_size
+            logger.info("✓ %s: %s (%s bytes)", description, file_path.name, f"{size:,}")
         else:
-            logger.warning(f"✗ Missing: {description}")
+            logger.warning("✗ Missing: %s", description)
     
     # Check visualizations
-    viz_dir = PROJECT_ROOT / "visualizations"
-    if viz_dir.exists():
-        viz_files = list(viz_dir.glob("*"))
+    viz_files = _scan_dir(VISUALIZATIONS_DIR)
+    if viz_files is not None:
         if viz_files:
-            logger.info(f"\n✓ Generated {len(viz_files)} visualization files")
-            for viz_file in viz_files[:5]:  # Show first 5
-                logger.info(f"  - {viz_file.name}")
+            logger.info("\n✓ Generated %d visualization files", len(viz_files))
+            for viz_name in list(viz_files)[:5]:  # Show first 5
+                logger.info("  - %s", viz_name)
         else:
             logger.warning("\n✗ No visualizations generated")
     else:
@@ -152,8 +197,7 @@ def main():
     logger.info("Next Steps")
     logger.info("="*60)
     
-    combined_data = PROJECT_ROOT / "data" / "combined" / "combined_data.csv"
-    if combined_data.exists():
+    if COMBINED_DATA_CSV.name in dir_entries[DATA_COMBINED]:
         logger.info("1. ✓ Combined data ready")
         logger.info("2. Launch dashboard: python src/visualization/dashboard.py")
         logger.info("3. Open browser to: http://127.0.0.1:8050")
@@ -6,6 +6,9 @@ Quick start script to run the complete CityPulse data pipeline
 import sys
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from importlib import import_module
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -16,47 +19,132 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps as (stage, step name, module path). Execution order comes
+# from each module's REQUIRES; this table order only breaks ties. Strings
+# are interned so sys.modules and cache lookups compare by identity.
+_STEPS = tuple(
+    (sys.intern(stage), sys.intern(name), sys.intern(module_path))
+    for stage, name, module_path in (
+        ("Data Collection", "311 Data", "data_collection.collect_311_data"),
+        ("Data Collection", "CTA Data", "data_collection.collect_cta_data"),
+        ("Data Collection", "Traffic Data", "data_collection.collect_traffic_data"),
+        ("Data Collection", "Crime Data", "data_collection.collect_crime_data"),
+        ("Data Cleaning", "Clean All Data", "data_cleaning.clean_data"),
+        ("Data Integration", "Integrate Data", "sentiment.integrate_data"),
+        ("Analysis & Visualization", "Correlation Analysis", "visualization.correlation_analysis"),
+        ("Analysis & Visualization", "Generate Visualizations", "visualization.visualizations")
+    )
+)
+
+@lru_cache(maxsize=None)
+def _cached_main(module_path):
+    """Import a pipeline module once and return its main(), or None"""
+    module = sys.modules.get(module_path) or import_module(module_path)
+    return getattr(module, 'main', None)
+
+def _requires(module_path):
+    """Return the pipeline steps a module declares in its REQUIRES attribute"""
+    try:
+        module = sys.modules.get(module_path) or import_module(module_path)
+    except Exception:
+        # Import errors are reported when the step itself runs
+        return ()
+    return tuple(getattr(module, 'REQUIRES', ()))
+
+@lru_cache(maxsize=None)
+def _execution_levels(module_paths):
+    """
+    Order pipeline steps by their REQUIRES using Kahn's algorithm
+    
+    Args:
+        module_paths: Tuple of module paths in the pipeline, in table order
+    
+    Returns:
+        Tuple of levels; every step in a level only depends on earlier levels
+    """
+    position = {path: i for i, path in enumerate(module_paths)}
+    indegree = dict.fromkeys(module_paths, 0)
+    dependents = {path: [] for path in module_paths}
+    for path in module_paths:
+        # Dependencies outside this pipeline are assumed to be satisfied
+        for dependency in set(_requires(path)) & position.keys():
+            dependents[dependency].append(path)
+            indegree[path] += 1
+    
+    levels = []
+    visited = set()
+    frontier = [path for path in module_paths if indegree[path] == 0]
+    while frontier:
+        levels.append(tuple(frontier))
+        visited.update(frontier)
+        next_frontier = []
+        for path in frontier:
+            for dependent in dependents[path]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0 and dependent not in visited:
+                    next_frontier.append(dependent)
+        frontier = sorted(next_frontier, key=position.get)
+    
+    if len(visited) != len(module_paths):
+        cycle = [path for path in module_paths if path not in visited]
+        raise ValueError(f"Circular REQUIRES between pipeline steps: {cycle}")
+    return tuple(levels)
+
+def _run_step(module_path):
+    """
+    Run a pipeline step's main() (top-level so worker processes can call it)
+    
+    Returns:
+        False if the module has no main() function, True otherwise
+    """
+    step_main = _cached_main(module_path)
+    if step_main is None:
+        return False
+    step_main()
+    return True
+
+def _report_step(module_name, module_path, get_result):
+    """Log the outcome of a pipeline step, continuing past failures"""
+    try:
+        if not get_result():
+            logger.warning("Module %s has no main() function", module_path)
+    except Exception as e:
+        logger.error("Error in %s: %s", module_name, e)
+        logger.info("Continuing with next step...")
+
 def main():
     """Run the complete pipeline"""
     logger.info("=" * 60)
     logger.info("CityPulse Data Pipeline")
     logger.info("=" * 60)
     
-    steps = [
-        ("Data Collection", [
-            ("311 Data", "data_collection.collect_311_data"),
-            ("CTA Data", "data_collection.collect_cta_data"),
-            ("Traffic Data", "data_collection.collect_traffic_data"),
-            ("Crime Data", "data_collection.collect_crime_data")
-        ]),
-        ("Data Cleaning", [
-            ("Clean All Data", "data_cleaning.clean_data")
-        ]),
-        ("Data Integration", [
-            ("Integrate Data", "sentiment.integrate_data")
-        ]),
-        ("Analysis & Visualization", [
-            ("Correlation Analysis", "visualization.correlation_analysis"),
-            ("Generate Visualizations", "visualization.visualizations")
-        ])
-    ]
+    step_names = {module_path: (stage, name) for stage, name, module_path in _STEPS}
     
-    for step_name, modules in steps:
-        logger.info(f"\n{'=' * 60}")
-        logger.info(f"Step: {step_name}")
-        logger.info(f"{'=' * 60}")
+    # Run in dependency order rather than table order
+    info = logger.info
+    for level in _execution_levels(tuple(step_names)):
+        step_name = " / ".join(dict.fromkeys(step_names[path][0] for path in level))
+        info("\n" + "=" * 60)
+        info("Step: %s", step_name)
+        info("=" * 60)
+        
+        if len(level) == 1:
+            module_path = level[0]
+            module_name = step_names[module_path][1]
+            info("\nRunning: %s...", module_name)
+            _report_step(module_name, module_path, lambda: _run_step(module_path))
+            continue
         
-        for module_name, module_path in modules:
-            try:
-                logger.info(f"\nRunning: {module_name}...")
-                module = __import__(module_path, fromlist=['main'])
-                if hasattr(module, 'main'):
-                    module.main()
-                else:
-                    logger.warning(f"Module {module_path} has no main() function")
-            except Exception as e:
-                logger.error(f"Error in {module_name}: {e}")
-                logger.info("Continuing with next step...")
+        # Steps in the same level don't depend on each other, so run them
+        # in separate processes and let their network/disk waits overlap
+        with ProcessPoolExecutor(max_workers=len(level)) as pool:
+            futures = {}
+            for module_path in level:
+                info("\nRunning: %s...", step_names[module_path][1])
+                futures[pool.submit(_run_step, module_path)] = module_path
+            for future in as_completed(futures):
+                module_path = futures[future]
+                _report_step(step_names[module_path][1], module_path, future.result)
     
     logger.info("\n" + "=" * 60)
     logger.info("Pipeline Complete!")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Convert existing raw and cleaned CSV files to Parquet
+One-off migration for data collected before the pipeline switched formats;
+the CSV files are left in place
+"""
+
+import sys
+import os
+import pandas as pd
+from pathlib import Path
+import logging
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_cleaning.clean_data import DATASETS, RAW_SCHEMAS, read_raw_csv
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RAW_DIR = PROJECT_ROOT / "data" / "raw"
+CLEANED_DIR = PROJECT_ROOT / "data" / "cleaned"
+
+
+def _is_current(parquet_path: Path, csv_path: Path) -> bool:
+    """True if the Parquet file exists and is at least as new as the CSV"""
+    return parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+
+
+def convert_raw_files() -> int:
+    """
+    Convert the raw collector CSVs, typed the way clean_data reads them
+    
+    Returns:
+        Number of files converted
+    """
+    converted = 0
+    for name in RAW_SCHEMAS:
+        csv_path = RAW_DIR / f"{name}.csv"
+        parquet_path = csv_path.with_suffix('.parquet')
+        if not csv_path.exists() or _is_current(parquet_path, csv_path):
+            continue
+        
+        df = read_raw_csv(csv_path.name)
+        df.to_parquet(parquet_path, compression='zstd', index=False)
+        logger.info(f"Converted {csv_path.name} -> {parquet_path.name} ({len(df)} rows)")
+        converted += 1
+    return converted
+
+
+def convert_cleaned_files() -> int:
+    """
+    Convert the cleaned dataset CSVs written by older clean_data runs
+    
+    Returns:
+        Number of files converted
+    """
+    converted = 0
+    for dataset in DATASETS:
+        parquet_path = CLEANED_DIR / dataset[3]
+        csv_path = parquet_path.with_suffix('.csv')
+        if not csv_path.exists() or _is_current(parquet_path, csv_path):
+            continue
+        
+        # Same dtypes read_cleaned_data gives the CSV, so readers see no change
+        df = pd.read_csv(csv_path, low_memory=False)
+        df.to_parquet(parquet_path, engine='pyarrow', compression='snappy', index=False)
+        logger.info(f"Converted {csv_path.name} -> {parquet_path.name} ({len(df)} rows)")
+        converted += 1
+    return converted
+
+
+def main():
+    """Convert every raw and cleaned CSV that has no up-to-date Parquet copy"""
+    converted = convert_raw_files() + convert_cleaned_files()
+    logger.info(f"Converted {converted} file(s) to Parquet")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,10 @@ Formats data optimally for these visualization tools
 
 import sys
 import os
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 import logging
 
@@ -21,6 +24,26 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent
+COMBINED_DATA_CSV = PROJECT_ROOT / "data" / "combined" / "combined_data.csv"
+EXPORTS_DIR = PROJECT_ROOT / "data" / "exports"
+
+DAY_NAMES = np.array([
+    'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'
+])
+SENTIMENT_CATEGORIES = ['Negative', 'Neutral', 'Positive']
+
+# Input columns used by prepare_tableau_data; anything else is dropped
+SOURCE_COLUMNS = {
+    'date', 'avg_polarity', 'std_polarity', 'avg_subjectivity',
+    'total_tweets', 'tweet_count', 'positive', 'neutral', 'negative',
+    'total_cta_rides', 'bus_rides', 'train_rides',
+    'total_311_complaints', 'transit_related_complaints'
+}
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    """Return a column as a float64 array, mapping missing values to NaN"""
+    return series.to_numpy(dtype=float, na_value=np.nan)
 
 
 def prepare_tableau_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -30,33 +53,45 @@ def prepare_tableau_data(df: pd.DataFrame) -> pd.DataFrame:
     - Adds calculated fields that are useful for visualization
     - Renames columns for clarity
     """
-    df_export = df.copy()
+    # Only copy the columns that are used or exported
+    df_export = df.loc[:, [col for col in df.columns if col in SOURCE_COLUMNS]].copy()
     
-    # Ensure date is datetime
-    df_export['date'] = pd.to_datetime(df_export['date'])
+    # Ensure date is datetime, materialized once as an index so every
+    # calendar field below reads from the same parsed values
+    dates = pd.DatetimeIndex(pd.to_datetime(df_export['date'], cache=True))
+    df_export['date'] = dates
     
     # Add calculated fields useful for visualization
-    df_export['year'] = df_export['date'].dt.year
-    df_export['month'] = df_export['date'].dt.month
-    df_export['day_of_week'] = df_export['date'].dt.day_name()
-    df_export['day_of_week_num'] = df_export['date'].dt.dayofweek
-    df_export['is_weekend'] = df_export['day_of_week_num'].isin([5, 6])
-    df_export['week'] = df_export['date'].dt.isocalendar().week
-    
-    # Calculate sentiment ratio
-    df_export['positive_ratio'] = df_export['positive'] / df_export['total_tweets'].replace(0, 1)
-    df_export['negative_ratio'] = df_export['negative'] / df_export['total_tweets'].replace(0, 1)
-    df_export['neutral_ratio'] = df_export['neutral'] / df_export['total_tweets'].replace(0, 1)
+    dow = dates.dayofweek.to_numpy()
+    df_export['year'] = dates.year
+    df_export['month'] = dates.month
+    df_export['day_of_week'] = DAY_NAMES[dow]
+    df_export['day_of_week_num'] = dow
+    df_export['is_weekend'] = dow >= 5
+    df_export['week'] = dates.isocalendar()['week'].to_numpy()
+    
+    # Calculate sentiment ratio (zero tweet days divide by 1)
+    tweets = _as_float(df_export['total_tweets'])
+    tweets = np.where(tweets == 0, 1.0, tweets)
+    df_export['positive_ratio'] = _as_float(df_export['positive']) / tweets
+    df_export['negative_ratio'] = _as_float(df_export['negative']) / tweets
+    df_export['neutral_ratio'] = _as_float(df_export['neutral']) / tweets
     
     # Calculate complaint rate per 1000 rides
-    df_export['complaints_per_1000_rides'] = (df_export['total_311_complaints'] / 
-                                             df_export['total_cta_rides'].replace(0, 1) * 1000)
+    rides = _as_float(df_export['total_cta_rides'])
+    rides = np.where(rides == 0, 1.0, rides)
+    df_export['complaints_per_1000_rides'] = (
+        _as_float(df_export['total_311_complaints']) / rides * 1000
+    )
     
     # Calculate sentiment score category
-    df_export['sentiment_category'] = pd.cut(
-        df_export['avg_polarity'],
-        bins=[-1, -0.05, 0.05, 1],
-        labels=['Negative', 'Neutral', 'Positive']
+    # Bucket codes match pd.cut(bins=[-1, -0.05, 0.05, 1]): right-closed,
+    # with anything outside (-1, 1] or missing left uncategorized (-1)
+    polarity = _as_float(df_export['avg_polarity'])
+    codes = (polarity > -0.05).astype(np.int8) + (polarity > 0.05).astype(np.int8)
+    codes[~((polarity > -1) & (polarity <= 1))] = -1
+    df_export['sentiment_category'] = pd.Categorical.from_codes(
+        codes, categories=SENTIMENT_CATEGORIES, ordered=True
     )
     
     # Reorder columns for better organization
@@ -76,44 +111,78 @@ def prepare_tableau_data(df: pd.DataFrame) -> pd.DataFrame:
     return df_export
 
 
-def export_to_excel(df: pd.DataFrame, output_path: Path):
-    """Export to Excel with multiple sheets for different views"""
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-        # Main combined dataset
-        df.to_excel(writer, sheet_name='Combined Data', index=False)
-        
-        # Summary statistics
-        summary = pd.DataFrame({
-            'Metric': [
-                'Total Days', 'Date Range Start', 'Date Range End',
-                'Total Tweets', 'Total CTA Rides', 'Total 311 Complaints',
-                'Avg Daily Sentiment', 'Avg Daily Rides', 'Avg Daily Complaints'
-            ],
-            'Value': [
-                len(df),
-                df['date'].min(),
-                df['date'].max(),
-                df['total_tweets'].sum(),
-                df['total_cta_rides'].sum(),
-                df['total_311_complaints'].sum(),
-                df['avg_polarity'].mean(),
-                df['total_cta_rides'].mean(),
-                df['total_311_complaints'].mean()
-            ]
-        })
-        summary.to_excel(writer, sheet_name='Summary', index=False)
-        
-        # Daily sentiment trends
-        sentiment_trends = df[['date', 'avg_polarity', 'total_tweets', 'positive', 'neutral', 'negative']].copy()
-        sentiment_trends.to_excel(writer, sheet_name='Sentiment Trends', index=False)
-        
-        # Ridership trends
-        ridership_trends = df[['date', 'total_cta_rides', 'bus_rides', 'train_rides']].copy()
-        ridership_trends.to_excel(writer, sheet_name='Ridership Trends', index=False)
-        
-        # Complaint trends
-        complaint_trends = df[['date', 'total_311_complaints', 'transit_related_complaints']].copy()
-        complaint_trends.to_excel(writer, sheet_name='Complaint Trends', index=False)
+def write_csv(df: pd.DataFrame, output_path: Path):
+    """Write the export CSV with Arrow's multithreaded writer"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if 'date' in table.column_names:
+        # Daily data: write plain YYYY-MM-DD dates rather than timestamps
+        date_index = table.column_names.index('date')
+        table = table.set_column(date_index, 'date', table['date'].cast(pa.date32()))
+    pacsv.write_csv(table, str(output_path))
+
+
+def _write_sheet(wb, sheet_name: str, header: list, rows):
+    """Stream rows into a new write-only sheet, one row at a time"""
+    ws = wb.create_sheet(sheet_name)
+    ws.append(header)
+    for row in rows:
+        # Leave missing values as empty cells, like DataFrame.to_excel
+        ws.append([None if pd.isna(value) else value for value in row])
+
+
+def _column_rows(df: pd.DataFrame, columns: list):
+    """Iterate rows of a column subset without building a sliced DataFrame"""
+    return zip(*(df[col] for col in columns))
+
+
+def export_to_excel(df: pd.DataFrame, output_path: Path,
+                    date_min=None, date_max=None):
+    """
+    Export to Excel with multiple sheets for different views
+    
+    date_min/date_max can be passed in when the caller already has the
+    date range; otherwise they are computed from df.
+    """
+    from openpyxl import Workbook
+    
+    # Write-only workbooks flush rows as they are appended instead of
+    # keeping every cell of every sheet in memory until save
+    wb = Workbook(write_only=True)
+    
+    # Main combined dataset
+    _write_sheet(wb, 'Combined Data', list(df.columns),
+                 df.itertuples(index=False, name=None))
+    
+    # Summary statistics
+    stats = df[['total_tweets', 'total_cta_rides', 'total_311_complaints',
+                'avg_polarity']].agg(['sum', 'mean'])
+    if date_min is None or date_max is None:
+        date_min, date_max = df['date'].agg(['min', 'max'])
+    _write_sheet(wb, 'Summary', ['Metric', 'Value'], [
+        ('Total Days', len(df)),
+        ('Date Range Start', date_min),
+        ('Date Range End', date_max),
+        ('Total Tweets', stats.at['sum', 'total_tweets']),
+        ('Total CTA Rides', stats.at['sum', 'total_cta_rides']),
+        ('Total 311 Complaints', stats.at['sum', 'total_311_complaints']),
+        ('Avg Daily Sentiment', stats.at['mean', 'avg_polarity']),
+        ('Avg Daily Rides', stats.at['mean', 'total_cta_rides']),
+        ('Avg Daily Complaints', stats.at['mean', 'total_311_complaints'])
+    ])
+    
+    # Daily sentiment trends
+    sentiment_cols = ['date', 'avg_polarity', 'total_tweets', 'positive', 'neutral', 'negative']
+    _write_sheet(wb, 'Sentiment Trends', sentiment_cols, _column_rows(df, sentiment_cols))
+    
+    # Ridership trends
+    ridership_cols = ['date', 'total_cta_rides', 'bus_rides', 'train_rides']
+    _write_sheet(wb, 'Ridership Trends', ridership_cols, _column_rows(df, ridership_cols))
+    
+    # Complaint trends
+    complaint_cols = ['date', 'total_311_complaints', 'transit_related_complaints']
+    _write_sheet(wb, 'Complaint Trends', complaint_cols, _column_rows(df, complaint_cols))
+    
+    wb.save(output_path)
 
 
 def main():
@@ -123,7 +192,7 @@ def main():
     logger.info("="*60)
     
     # Load combined data
-    combined_path = PROJECT_ROOT / "data" / "combined" / "combined_data.csv"
+    combined_path = COMBINED_DATA_CSV
     if not combined_path.exists():
         logger.error(f"Combined data not found: {combined_path}")
         logger.error("Please run the data integration step first:")
@@ -131,27 +200,31 @@ def main():
         return
     
     logger.info(f"Loading combined data from: {combined_path}")
-    df = pd.read_csv(combined_path)
+    # Arrow's multithreaded reader; parse_dates yields Arrow date32 values,
+    # which prepare_tableau_data converts to datetime64 in one step
+    df = pd.read_csv(combined_path, engine='pyarrow', dtype_backend='pyarrow',
+                     parse_dates=['date'])
     logger.info(f"Loaded {len(df)} rows")
     
     # Prepare data for Tableau/Power BI
     logger.info("\nPreparing data for Tableau/Power BI...")
     df_export = prepare_tableau_data(df)
     logger.info(f"Prepared {len(df_export)} rows with {len(df_export.columns)} columns")
+    date_min, date_max = df_export['date'].agg(['min', 'max'])
     
     # Create exports directory
-    exports_dir = PROJECT_ROOT / "data" / "exports"
+    exports_dir = EXPORTS_DIR
     exports_dir.mkdir(parents=True, exist_ok=True)
     
     # Export to CSV (primary format)
     csv_path = exports_dir / "combined_data_for_tableau.csv"
-    df_export.to_csv(csv_path, index=False)
+    write_csv(df_export, csv_path)
     logger.info(f"\n✓ Exported CSV to: {csv_path}")
     
     # Export to Excel (if openpyxl is available)
     try:
         excel_path = exports_dir / "combined_data_for_tableau.xlsx"
-        export_to_excel(df_export, excel_path)
+        export_to_excel(df_export, excel_path, date_min, date_max)
         logger.info(f"✓ Exported Excel to: {excel_path}")
     except ImportError:
         logger.warning("openpyxl not installed - skipping Excel export")
@@ -163,7 +236,7 @@ def main():
     logger.info("\n" + "="*60)
     logger.info("Export Summary")
     logger.info("="*60)
-    logger.info(f"Date Range: {df_export['date'].min()} to {df_export['date'].max()}")
+    logger.info(f"Date Range: {date_min} to {date_max}")
     logger.info(f"Total Days: {len(df_export)}")
     logger.info(f"Columns: {len(df_export.columns)}")
     logger.info(f"\nColumn List:")
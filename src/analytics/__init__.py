@@ -17,18 +17,23 @@ from .neighborhood_analysis import (
     compare_neighborhoods,
     rank_hotspots_by_metric,
     get_top_hotspots,
-    format_hotspot_description
+    format_hotspot_description,
+    format_hotspot_descriptions
 )
 
 from .temporal_analysis import (
     analyze_day_of_week_patterns,
     analyze_time_patterns,
     get_peak_days,
+    get_peak_days_batch,
     format_temporal_insight,
+    format_temporal_insights,
     get_seasonal_patterns
 )
 
 from .simple_correlations import (
+    CorrelationResult,
+    compute_correlations,
     calculate_simple_correlations,
     format_correlation_insight,
     get_top_correlations,
@@ -38,8 +43,11 @@ from .simple_correlations import (
 from .health_scores import (
     calculate_urban_health_index,
     get_health_status,
+    get_health_status_array,
     calculate_route_efficiency_score,
+    calculate_route_efficiency_score_batch,
     calculate_safety_index,
+    calculate_safety_index_batch,
     calculate_trend_indicator
 )
 
@@ -58,13 +66,18 @@ __all__ = [
     'rank_hotspots_by_metric',
     'get_top_hotspots',
     'format_hotspot_description',
+    'format_hotspot_descriptions',
     # Temporal analysis
     'analyze_day_of_week_patterns',
     'analyze_time_patterns',
     'get_peak_days',
+    'get_peak_days_batch',
     'format_temporal_insight',
+    'format_temporal_insights',
     'get_seasonal_patterns',
     # Simple correlations
+    'CorrelationResult',
+    'compute_correlations',
     'calculate_simple_correlations',
     'format_correlation_insight',
     'get_top_correlations',
@@ -72,8 +85,11 @@ __all__ = [
     # Health scores
     'calculate_urban_health_index',
     'get_health_status',
+    'get_health_status_array',
     'calculate_route_efficiency_score',
+    'calculate_route_efficiency_score_batch',
     'calculate_safety_index',
+    'calculate_safety_index_batch',
     'calculate_trend_indicator'
 ]
 
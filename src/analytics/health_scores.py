@@ -9,6 +9,54 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Health status lookup: a score's index into _STATUS_TABLE is the number of
+# thresholds it meets or exceeds
+_STATUS_BINS = np.array([4.0, 6.0, 8.0])
+_STATUS_TABLE = (
+    {'label': 'Needs Attention', 'color': '#dc3545', 'emoji': '🔴'},  # Red
+    {'label': 'Fair', 'color': '#fd7e14', 'emoji': '🟠'},  # Orange
+    {'label': 'Good', 'color': '#ffc107', 'emoji': '🟡'},  # Yellow
+    {'label': 'Excellent', 'color': '#28a745', 'emoji': '🟢'},  # Green
+)
+_STATUS_COLUMNS = {
+    key: np.array([status[key] for status in _STATUS_TABLE])
+    for key in ('label', 'color', 'emoji')
+}
+_EFFICIENCY_STATUS_LABELS = np.array(['Needs Improvement', 'Fair', 'Good', 'Excellent'])
+
+
+def _normalize_metric_kernel(value, min_val, max_val, higher_is_better):
+    """Scalar normalization shared by normalize_metric and its array version"""
+    if max_val == min_val:
+        return 5.0  # Neutral score if no variation
+    
+    if higher_is_better:
+        # Higher is better: normalize 0-10 where max = 10, min = 0
+        normalized = ((value - min_val) / (max_val - min_val)) * 10
+    else:
+        # Lower is better: invert so lower values get higher scores
+        normalized = ((max_val - value) / (max_val - min_val)) * 10
+    
+    # Clamp to 0-10 (same comparisons as max(0, min(10, normalized)))
+    normalized = normalized if normalized < 10 else 10.0
+    return normalized if normalized > 0 else 0.0
+
+
+if NUMBA_AVAILABLE:
+    # Compiled on first call, not at import, so importing the package stays
+    # cheap for callers that never normalize (callers always pass floats and
+    # a bool, so one specialization is built). No on-disk cache: numba's
+    # cache records the module name, so it breaks when the module is
+    # imported both as src.analytics.* and as analytics.*
+    _normalize_metric_ufunc = numba.vectorize(_normalize_metric_kernel)
+    _normalize_metric_kernel = numba.njit(_normalize_metric_kernel)
+
 
 def normalize_metric(value: float, min_val: float, max_val: float, 
                      higher_is_better: bool = True) -> float:
@@ -25,18 +73,40 @@ def normalize_metric(value: float, min_val: float, max_val: float,
     Returns:
         Normalized score (0-10)
     """
-    if max_val == min_val:
-        return 5.0  # Neutral score if no variation
+    return _normalize_metric_kernel(float(value), float(min_val), float(max_val),
+                                    bool(higher_is_better))
+
+
+def _normalize_metric_vec(values, min_val, max_val, higher_is_better=True) -> np.ndarray:
+    """
+    Array version of normalize_metric
     
-    if higher_is_better:
-        # Higher is better: normalize 0-10 where max = 10, min = 0
-        normalized = ((value - min_val) / (max_val - min_val)) * 10
-    else:
-        # Lower is better: invert so lower values get higher scores
-        normalized = ((max_val - value) / (max_val - min_val)) * 10
+    All arguments broadcast against each other, so a single call can
+    normalize many values against one range or several metrics at once.
+    Uses a compiled numba ufunc when numba is installed.
+    
+    Returns:
+        Array of normalized scores (0-10)
+    """
+    values = np.asarray(values, dtype=float)
+    min_val = np.asarray(min_val, dtype=float)
+    max_val = np.asarray(max_val, dtype=float)
+    higher_is_better = np.asarray(higher_is_better, dtype=bool)
+    
+    if NUMBA_AVAILABLE:
+        return _normalize_metric_ufunc(values, min_val, max_val, higher_is_better)
     
-    # Clamp to 0-10
-    return max(0, min(10, normalized))
+    value_range = max_val - min_val
+    no_variation = value_range == 0
+    offset = np.where(higher_is_better, values - min_val, max_val - values)
+    normalized = offset / np.where(no_variation, 1.0, value_range) * 10
+    
+    # Clamp to 0-10 with the same comparisons as the scalar version
+    normalized = np.where(normalized < 10, normalized, 10.0)
+    normalized = np.where(normalized > 0, normalized, 0.0)
+    
+    # Neutral score where there is no variation
+    return np.where(no_variation, 5.0, normalized)
 
 
 def calculate_urban_health_index(df: pd.DataFrame, 
@@ -58,34 +128,27 @@ def calculate_urban_health_index(df: pd.DataFrame,
     if df.empty:
         return {}
     
-    # Get current period averages (or use all data if single period)
-    if len(df) == 1:
-        current_ridership = df[ridership_col].iloc[0] if ridership_col in df.columns else 0
-        current_complaints = df[complaints_col].iloc[0] if complaints_col in df.columns else 0
-        current_crime = df[crime_col].iloc[0] if crime_col in df.columns else 0
-    else:
-        current_ridership = df[ridership_col].mean() if ridership_col in df.columns else 0
-        current_complaints = df[complaints_col].mean() if complaints_col in df.columns else 0
-        current_crime = df[crime_col].mean() if crime_col in df.columns else 0
-    
-    # Calculate ranges for normalization (use historical data if available)
-    ridership_min = df[ridership_col].min() if ridership_col in df.columns else 0
-    ridership_max = df[ridership_col].max() if ridership_col in df.columns else 1
-    
-    complaints_min = df[complaints_col].min() if complaints_col in df.columns else 0
-    complaints_max = df[complaints_col].max() if complaints_col in df.columns else 1
-    
-    crime_min = df[crime_col].min() if crime_col in df.columns else 0
-    crime_max = df[crime_col].max() if crime_col in df.columns else 1
+    # Current value (period average) and normalization range per metric,
+    # computed in one aggregation over the columns that are present.
+    # Missing metrics fall back to a value of 0 on a 0-1 range.
+    columns = [ridership_col, complaints_col, crime_col]
+    means = np.zeros(3)
+    mins = np.zeros(3)
+    maxs = np.ones(3)
+    present = [i for i, col in enumerate(columns) if col in df.columns]
+    if present:
+        stats = df[[columns[i] for i in present]].agg(['mean', 'min', 'max'])
+        means[present], mins[present], maxs[present] = stats.to_numpy(dtype=float)
     
     # Normalize each metric to 0-10 scale
     # Higher ridership = better, Lower complaints/crime = better
-    ridership_score = normalize_metric(current_ridership, ridership_min, ridership_max, 
-                                      higher_is_better=True)
-    complaints_score = normalize_metric(current_complaints, complaints_min, complaints_max, 
-                                       higher_is_better=False)
-    crime_score = normalize_metric(current_crime, crime_min, crime_max, 
-                                  higher_is_better=False)
+    scores = _normalize_metric_vec(means, mins, maxs,
+                                   higher_is_better=np.array([True, False, False]))
+    
+    current_ridership, current_complaints, current_crime = means.tolist()
+    ridership_min, complaints_min, crime_min = mins.tolist()
+    ridership_max, complaints_max, crime_max = maxs.tolist()
+    ridership_score, complaints_score, crime_score = scores.tolist()
     
     # Weighted combination
     # Weights: Ridership (40%), Complaints (30%), Crime (30%)
@@ -127,6 +190,13 @@ def calculate_urban_health_index(df: pd.DataFrame,
     }
 
 
+def _health_status_index(scores) -> np.ndarray:
+    """Map scores to rows of _STATUS_TABLE (missing scores need attention)"""
+    scores = np.asarray(scores, dtype=float)
+    index = np.searchsorted(_STATUS_BINS, scores, side='right')
+    return np.where(np.isnan(scores), 0, index)
+
+
 def get_health_status(score: float) -> dict:
     """
     Get health status label and color based on score
@@ -137,30 +207,21 @@ def get_health_status(score: float) -> dict:
     Returns:
         Dictionary with label, color, and emoji
     """
-    if score >= 8:
-        return {
-            'label': 'Excellent',
-            'color': '#28a745',  # Green
-            'emoji': '🟢'
-        }
-    elif score >= 6:
-        return {
-            'label': 'Good',
-            'color': '#ffc107',  # Yellow
-            'emoji': '🟡'
-        }
-    elif score >= 4:
-        return {
-            'label': 'Fair',
-            'color': '#fd7e14',  # Orange
-            'emoji': '🟠'
-        }
-    else:
-        return {
-            'label': 'Needs Attention',
-            'color': '#dc3545',  # Red
-            'emoji': '🔴'
-        }
+    return dict(_STATUS_TABLE[int(_health_status_index(score))])
+
+
+def get_health_status_array(scores) -> dict:
+    """
+    Get health status labels and colors for many scores at once
+    
+    Args:
+        scores: Array-like of health scores (0-10)
+    
+    Returns:
+        Dictionary of 'label', 'color' and 'emoji' arrays parallel to scores
+    """
+    index = _health_status_index(scores)
+    return {key: values[index] for key, values in _STATUS_COLUMNS.items()}
 
 
 def calculate_route_efficiency_score(ridership: float, complaints: float) -> dict:
@@ -196,6 +257,38 @@ def calculate_route_efficiency_score(ridership: float, complaints: float) -> dic
     }
 
 
+def calculate_route_efficiency_score_batch(ridership, complaints) -> dict:
+    """
+    Calculate efficiency scores for many periods or routes at once
+    
+    Array version of calculate_route_efficiency_score.
+    
+    Args:
+        ridership: Array-like of total ridership
+        complaints: Array-like of total complaints
+    
+    Returns:
+        Dictionary of 'rides_per_complaint', 'efficiency_score' and
+        'status' arrays parallel to the inputs
+    """
+    # Broadcast first so a scalar on either side still gives a full-size buffer
+    ridership, complaints = np.broadcast_arrays(np.asarray(ridership, dtype=float),
+                                                np.asarray(complaints, dtype=float))
+    
+    # Periods without complaints count every ride as efficient
+    rides_per_complaint = np.where(ridership > 0, ridership, 0.0)
+    np.divide(ridership, complaints, out=rides_per_complaint, where=complaints != 0)
+    
+    efficiency_score = _normalize_metric_vec(rides_per_complaint, 100, 10000,
+                                             higher_is_better=True)
+    
+    return {
+        'rides_per_complaint': np.round(rides_per_complaint, 0),
+        'efficiency_score': np.round(efficiency_score, 1),
+        'status': _EFFICIENCY_STATUS_LABELS[_health_status_index(efficiency_score)]
+    }
+
+
 def calculate_safety_index(ridership: float, crime: float) -> dict:
     """
     Calculate safety index: crimes per 1000 rides
@@ -229,6 +322,37 @@ def calculate_safety_index(ridership: float, crime: float) -> dict:
     }
 
 
+def calculate_safety_index_batch(ridership, crime) -> dict:
+    """
+    Calculate safety indices for many periods or areas at once
+    
+    Array version of calculate_safety_index.
+    
+    Args:
+        ridership: Array-like of total ridership
+        crime: Array-like of total crimes
+    
+    Returns:
+        Dictionary of 'crimes_per_1000_rides', 'safety_score' and 'status'
+        arrays parallel to the inputs
+    """
+    ridership = np.asarray(ridership, dtype=float)
+    crime = np.asarray(crime, dtype=float)
+    
+    # Periods without ridership report zero crimes per 1000 rides
+    crimes_per_1000 = np.zeros(np.broadcast(ridership, crime).shape)
+    np.divide(crime * 1000, ridership, out=crimes_per_1000, where=ridership != 0)
+    
+    safety_score = _normalize_metric_vec(crimes_per_1000, 0.1, 10,
+                                         higher_is_better=False)
+    
+    return {
+        'crimes_per_1000_rides': np.round(crimes_per_1000, 2),
+        'safety_score': np.round(safety_score, 1),
+        'status': _STATUS_COLUMNS['label'][_health_status_index(safety_score)]
+    }
+
+
 def calculate_trend_indicator(current_value: float, previous_value: float, 
                               higher_is_better: bool = True) -> dict:
     """
@@ -10,9 +10,11 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Mean Earth radius, for converting haversine distances to kilometers
+EARTH_RADIUS_KM = 6371.0088
+
 try:
     from sklearn.cluster import DBSCAN
-    from sklearn.preprocessing import StandardScaler
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
@@ -35,9 +37,11 @@ def aggregate_by_neighborhood(df: pd.DataFrame, lat_col: str = 'latitude', lon_c
         logger.warning("community_area column not found - cannot aggregate by neighborhood")
         return pd.DataFrame()
     
-    # Group by community area - use sr_number or any available ID column
+    # Group by community area - use sr_number or any available ID column.
+    # Grouping on categorical codes avoids hashing every key value.
     count_col = 'sr_number' if 'sr_number' in df.columns else ('service_request_number' if 'service_request_number' in df.columns else df.columns[0])
-    neighborhood_stats = df.groupby('community_area').agg({
+    areas = df['community_area'].astype('category')
+    neighborhood_stats = df.groupby(areas, observed=True).agg({
         count_col: 'count',
         lat_col: 'mean',
         lon_col: 'mean'
@@ -45,14 +49,16 @@ def aggregate_by_neighborhood(df: pd.DataFrame, lat_col: str = 'latitude', lon_c
         count_col: 'complaint_count',
         lat_col: 'avg_latitude',
         lon_col: 'avg_longitude'
-    }).reset_index()
+    })
     
     # Add complaint type breakdown if available
     type_col = 'sr_type' if 'sr_type' in df.columns else ('service_request_type' if 'service_request_type' in df.columns else None)
     if type_col:
-        type_counts = df.groupby(['community_area', type_col]).size().reset_index(name='count')
-        type_pivot = type_counts.pivot(index='community_area', columns=type_col, values='count').fillna(0)
-        neighborhood_stats = neighborhood_stats.merge(type_pivot, left_on='community_area', right_index=True, how='left')
+        type_pivot = pd.crosstab(areas, df[type_col].astype('category').cat.remove_unused_categories())
+        neighborhood_stats = neighborhood_stats.join(type_pivot, how='left')
+    
+    neighborhood_stats = neighborhood_stats.reset_index()
+    neighborhood_stats['community_area'] = neighborhood_stats['community_area'].astype(df['community_area'].dtype)
     
     return neighborhood_stats
 
@@ -71,35 +77,73 @@ def aggregate_by_ward(df: pd.DataFrame):
         logger.warning("ward column not found - cannot aggregate by ward")
         return pd.DataFrame()
     
-    # Group by ward - use sr_number or any available ID column
-    count_col = 'sr_number' if 'sr_number' in df.columns else ('service_request_number' if 'service_request_number' in df.columns else df.columns[0])
-    ward_stats = df.groupby('ward').agg({
-        count_col: 'count'
-    }).rename(columns={
-        count_col: 'complaint_count'
-    }).reset_index()
+    # Group on categorical codes rather than hashing every ward value
+    type_col = 'sr_type' if 'sr_type' in df.columns else ('service_request_type' if 'service_request_type' in df.columns else None)
+    wards = df['ward'].astype('category')
+    ward_stats = df.groupby(wards, observed=True).size().rename('complaint_count').to_frame()
     
     # Add complaint type breakdown if available
-    type_col = 'sr_type' if 'sr_type' in df.columns else ('service_request_type' if 'service_request_type' in df.columns else None)
     if type_col:
-        type_counts = df.groupby(['ward', type_col]).size().reset_index(name='count')
-        type_pivot = type_counts.pivot(index='ward', columns=type_col, values='count').fillna(0)
-        ward_stats = ward_stats.merge(type_pivot, left_on='ward', right_index=True, how='left')
+        type_pivot = pd.crosstab(wards, df[type_col].astype('category').cat.remove_unused_categories())
+        ward_stats = ward_stats.join(type_pivot, how='left')
+    
+    ward_stats = ward_stats.reset_index()
+    ward_stats['ward'] = ward_stats['ward'].astype(df['ward'].dtype)
     
     return ward_stats
 
 
+def _valid_coordinates(df: pd.DataFrame, lat_col: str, lon_col: str):
+    """
+    Extract the rows with both coordinates present as a NumPy array
+    
+    Args:
+        df: DataFrame with geographic data
+        lat_col: Name of latitude column
+        lon_col: Name of longitude column
+    
+    Returns:
+        tuple: (C-contiguous float64 [lat, lon] array of valid rows,
+        boolean mask of those rows in df)
+    """
+    coords = df[[lat_col, lon_col]].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid_mask = ~np.isnan(coords).any(axis=1)
+    return np.ascontiguousarray(coords[valid_mask]), valid_mask
+
+
+def _equal_width_bins(values: np.ndarray, n_bins: int) -> np.ndarray:
+    """
+    Bin codes for n_bins equal-width bins spanning values (like pd.cut with
+    an integer bin count, right-closed)
+    
+    Only the interior edges are searched, so the minimum and maximum always
+    land in the first and last bins.
+    
+    Args:
+        values: 1-D array of values
+        n_bins: Number of bins
+    
+    Returns:
+        np.int32 array of bin codes in [0, n_bins)
+    """
+    edges = np.linspace(values.min(), values.max(), n_bins + 1)
+    return np.digitize(values, edges[1:-1], right=True).astype(np.int32)
+
+
 def detect_hotspots(df: pd.DataFrame, lat_col: str = 'latitude', lon_col: str = 'longitude', 
-                    min_samples: int = 5, eps: float = 0.01):
+                    min_samples: int = 5, eps: float = 0.1):
     """
     Detect geographic hotspots using DBSCAN clustering
     
+    Points are clustered by great-circle (haversine) distance using a
+    ball tree, so eps is a real distance on the ground.
+    
     Args:
         df: DataFrame with geographic data
         lat_col: Name of latitude column
         lon_col: Name of longitude column
         min_samples: Minimum samples for DBSCAN cluster
-        eps: Maximum distance for DBSCAN
+        eps: Maximum distance between neighboring points, in kilometers
     
     Returns:
         DataFrame: Original data with hotspot labels
@@ -108,29 +152,27 @@ def detect_hotspots(df: pd.DataFrame, lat_col: str = 'latitude', lon_col: str =
         logger.warning("scikit-learn not available - using simple density-based hotspot detection")
         return detect_hotspots_simple(df, lat_col, lon_col)
     
-    # Filter valid coordinates
-    valid_mask = df[lat_col].notna() & df[lon_col].notna()
-    df_valid = df[valid_mask].copy()
+    # Filter valid coordinates by position, without copying the valid rows
+    coords, valid_mask = _valid_coordinates(df, lat_col, lon_col)
     
-    if len(df_valid) < min_samples:
+    if len(coords) < min_samples:
         logger.warning("Insufficient data points for hotspot detection")
         df['hotspot_label'] = -1
         return df
     
-    # Prepare coordinates
-    coords = df_valid[[lat_col, lon_col]].values
-    
-    # Standardize coordinates (important for DBSCAN)
-    scaler = StandardScaler()
-    coords_scaled = scaler.fit_transform(coords)
+    # Prepare coordinates (haversine expects [lat, lon] in radians). float32
+    # keeps sub-metre precision and halves the memory the ball tree walks.
+    coords = np.radians(coords).astype(np.float32)
     
     # Apply DBSCAN
-    dbscan = DBSCAN(eps=eps, min_samples=min_samples)
-    labels = dbscan.fit_predict(coords_scaled)
+    dbscan = DBSCAN(eps=eps / EARTH_RADIUS_KM, min_samples=min_samples,
+                    algorithm='ball_tree', metric='haversine', n_jobs=-1)
+    labels = dbscan.fit_predict(coords)
     
-    # Add labels to dataframe
-    df['hotspot_label'] = -1
-    df.loc[valid_mask, 'hotspot_label'] = labels
+    # Add labels to dataframe in a single column assignment
+    hotspot_labels = np.full(len(df), -1, dtype=np.int32)
+    hotspot_labels[valid_mask] = labels
+    df['hotspot_label'] = hotspot_labels
     
     # Calculate hotspot statistics - use sr_number or any available ID column
     count_col = 'sr_number' if 'sr_number' in df.columns else ('service_request_number' if 'service_request_number' in df.columns else df.columns[0])
@@ -161,11 +203,10 @@ def detect_hotspots_simple(df: pd.DataFrame, lat_col: str = 'latitude', lon_col:
     Returns:
         tuple: (df with hotspot labels, hotspot statistics)
     """
-    # Filter valid coordinates
-    valid_mask = df[lat_col].notna() & df[lon_col].notna()
-    df_valid = df[valid_mask].copy()
+    # Filter valid coordinates by position, without copying the valid rows
+    coords, valid_mask = _valid_coordinates(df, lat_col, lon_col)
     
-    if len(df_valid) == 0:
+    if len(coords) == 0:
         df['hotspot_label'] = -1
         return df, pd.DataFrame()
     
@@ -174,21 +215,27 @@ def detect_hotspots_simple(df: pd.DataFrame, lat_col: str = 'latitude', lon_col:
     lat_bins = 20
     lon_bins = 20
     
-    df_valid['lat_bin'] = pd.cut(df_valid[lat_col], bins=lat_bins, labels=False)
-    df_valid['lon_bin'] = pd.cut(df_valid[lon_col], bins=lon_bins, labels=False)
+    coords = coords.astype(np.float32)
+    lat_bin = _equal_width_bins(coords[:, 0], lat_bins)
+    lon_bin = _equal_width_bins(coords[:, 1], lon_bins)
     
-    # Count points per cell
-    cell_counts = df_valid.groupby(['lat_bin', 'lon_bin']).size().reset_index(name='count')
+    # Count points per cell, keyed by a single flattened cell index
+    cell_key = lat_bin.astype(np.intp) * lon_bins + lon_bin
+    cell_counts = np.bincount(cell_key, minlength=lat_bins * lon_bins)
+    occupied = np.flatnonzero(cell_counts)
     
-    # Identify hotspots (top 10% of cells by count)
-    threshold = cell_counts['count'].quantile(0.9)
-    hotspot_cells = cell_counts[cell_counts['count'] >= threshold]
+    # Identify hotspots (top 10% of occupied cells by count)
+    threshold = np.quantile(cell_counts[occupied], 0.9)
     
-    # Assign hotspot labels
-    df['hotspot_label'] = -1
-    for idx, row in hotspot_cells.iterrows():
-        mask = (df_valid['lat_bin'] == row['lat_bin']) & (df_valid['lon_bin'] == row['lon_bin'])
-        df.loc[df_valid[mask].index, 'hotspot_label'] = idx
+    # Assign hotspot labels: each hotspot cell is labelled by its position
+    # among the occupied cells, every other cell maps to -1
+    label_lut = np.full(lat_bins * lon_bins, -1, dtype=np.int32)
+    hot = cell_counts[occupied] >= threshold
+    label_lut[occupied[hot]] = np.flatnonzero(hot)
+    
+    hotspot_labels = np.full(len(df), -1, dtype=np.int32)
+    hotspot_labels[valid_mask] = label_lut[cell_key]
+    df['hotspot_label'] = hotspot_labels
     
     # Calculate hotspot centers - use sr_number or any available ID column
     count_col = 'sr_number' if 'sr_number' in df.columns else ('service_request_number' if 'service_request_number' in df.columns else df.columns[0])
@@ -311,3 +358,55 @@ def format_hotspot_description(hotspot_row: pd.Series,
     
     return description
 
+
+
+def format_hotspot_descriptions(hotspot_stats: pd.DataFrame,
+                                include_coords: bool = False) -> pd.Series:
+    """
+    Create plain-language descriptions for every hotspot at once
+    
+    Vectorized equivalent of calling format_hotspot_description on each row.
+    
+    Args:
+        hotspot_stats: DataFrame with point_count, center_latitude, center_longitude
+        include_coords: Whether to include coordinates in descriptions
+    
+    Returns:
+        Series of description strings, indexed like hotspot_stats
+    """
+    n = len(hotspot_stats)
+    point_count = (hotspot_stats['point_count'].to_numpy() if 'point_count' in hotspot_stats.columns
+                   else np.zeros(n))
+    if 'center_latitude' in hotspot_stats.columns and 'center_longitude' in hotspot_stats.columns:
+        lat = hotspot_stats['center_latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+        lon = hotspot_stats['center_longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+        # Same truthiness test as the per-row version: zero means no coordinates
+        has_coords = (lat != 0) & (lon != 0)
+    else:
+        lat = lon = np.full(n, np.nan)
+        has_coords = np.zeros(n, dtype=bool)
+    
+    # Chicago approximate boundaries, checked in the same order as
+    # format_hotspot_description
+    area_names = np.select(
+        [
+            ~has_coords,
+            (41.85 <= lat) & (lat <= 41.95) & (-87.75 <= lon) & (lon <= -87.60),
+            lat > 41.90,
+            lat < 41.80,
+            lon < -87.70,
+        ],
+        ['Area', 'Downtown Area', 'North Side', 'South Side', 'West Side'],
+        default='Central Area'
+    )
+    
+    # Concatenate as object arrays so each element stays a plain str
+    descriptions = (area_names.astype(object) + ' - '
+                    + point_count.astype(int).astype(str).astype(object) + ' incidents')
+    
+    if include_coords:
+        coords = (' (Lat: ' + np.char.mod('%.4f', lat).astype(object)
+                  + ', Lon: ' + np.char.mod('%.4f', lon).astype(object) + ')')
+        descriptions = np.where(has_coords, descriptions + coords, descriptions)
+    
+    return pd.Series(descriptions, index=hotspot_stats.index, dtype=object)
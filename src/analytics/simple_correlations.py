@@ -5,74 +5,252 @@ Provides easy-to-understand correlation insights in plain language
 
 import pandas as pd
 import numpy as np
-from scipy.stats import pearsonr
+from dataclasses import dataclass
+from functools import lru_cache
+from scipy import stats
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Display names for the common metric columns
+_VAR_NAME_REPLACEMENTS = {
+    'total_cta_rides': 'CTA Ridership',
+    'total_311_complaints': '311 Complaints',
+    'total_crimes': 'Crimes',
+    'total_traffic_volume': 'Traffic Volume',
+    'total_arrests': 'Arrests',
+    'bus_rides': 'Bus Rides',
+    'train_rides': 'Train Rides'
+}
 
-def calculate_simple_correlations(df: pd.DataFrame, 
-                                  metric_cols: list = None) -> dict:
+
+@dataclass
+class CorrelationResult:
     """
-    Calculate all pairwise correlations between metrics
+    Pairwise correlations for a set of metrics, computed once and shared by
+    calculate_simple_correlations, get_top_correlations and
+    get_correlation_summary
+    
+    Attributes:
+        cols: Metric column names, in matrix order
+        r: Square matrix of Pearson correlations
+        p: Square matrix of two-sided p-values
+        n_pairs: Square matrix of complete-pair counts
+        correlation_matrix: DataFrame.corr() of the metric columns
+        pair_rows: Row index of each reported pair (upper triangle order)
+        pair_cols: Column index of each reported pair (upper triangle order)
+    """
+    cols: list
+    r: np.ndarray
+    p: np.ndarray
+    n_pairs: np.ndarray
+    correlation_matrix: pd.DataFrame
+    pair_rows: np.ndarray
+    pair_cols: np.ndarray
+    
+    def pair_values(self, matrix: np.ndarray) -> np.ndarray:
+        """Values of a square matrix for the reported pairs"""
+        return matrix[self.pair_rows, self.pair_cols]
+    
+    def strongest(self, top_k: int = None, subset: np.ndarray = None) -> np.ndarray:
+        """
+        Pair indices ordered by descending absolute correlation
+        
+        Args:
+            top_k: Only return the k strongest pairs (default: all)
+            subset: Restrict the ranking to these pair indices (default: all)
+        
+        Returns:
+            Index array into the reported pairs
+        """
+        r = self.pair_values(self.r)
+        if subset is None:
+            return _strongest_first(r, top_k)
+        return subset[_strongest_first(r[subset], top_k)]
+    
+    def pair_dicts(self, order: np.ndarray) -> list:
+        """
+        Build the pairwise correlation dicts for the selected pairs
+        
+        Args:
+            order: Indices into the reported pairs, in output order
+        
+        Returns:
+            List of correlation dictionaries with plain language insights
+        """
+        correlations = []
+        for i, j in zip(self.pair_rows[order], self.pair_cols[order]):
+            col1 = self.cols[i]
+            col2 = self.cols[j]
+            corr = self.r[i, j]
+            p_value = self.p[i, j]
+            
+            correlations.append({
+                'var1': col1,
+                'var2': col2,
+                'correlation': corr,
+                'p_value': p_value,
+                'significant': p_value < 0.05,
+                'n': int(self.n_pairs[i, j]),
+                'insight': format_correlation_insight(corr, col1, col2, p_value)
+            })
+        return correlations
+
+
+def compute_correlations(df: pd.DataFrame, metric_cols: list = None) -> CorrelationResult:
+    """
+    Compute all pairwise correlations between metrics once
+    
+    Pass the result to get_top_correlations and get_correlation_summary
+    instead of the DataFrame to reuse the matrix rather than recompute it.
     
     Args:
         df: DataFrame with metric columns
         metric_cols: List of columns to correlate (default: auto-detect numeric)
     
     Returns:
-        Dictionary with correlation matrix and insights
+        CorrelationResult, or None if there is nothing to correlate
     """
     if df.empty:
-        return {}
+        return None
     
     # Auto-detect metric columns if not provided
     if metric_cols is None:
-        metric_cols = [col for col in df.columns 
-                      if df[col].dtype in [np.int64, np.float64] 
-                      and col not in ['date', 'day_of_week', 'month']]
+        # select_dtypes also matches 32-bit, nullable and Arrow-backed numbers
+        metric_cols = [col for col in df.select_dtypes(include='number').columns
+                      if col not in ('date', 'day_of_week', 'month')]
     
     if len(metric_cols) < 2:
         logger.warning("Need at least 2 numeric columns for correlation")
-        return {}
+        return None
     
     # Calculate correlation matrix
     corr_matrix = df[metric_cols].corr()
     
-    # Get all pairwise correlations
-    correlations = []
-    for i, col1 in enumerate(metric_cols):
-        for col2 in metric_cols[i+1:]:
-            # Remove NaN pairs
-            mask = ~(df[col1].isna() | df[col2].isna())
-            if mask.sum() < 3:
-                continue
-            
-            x = df.loc[mask, col1]
-            y = df.loc[mask, col2]
-            
-            corr, p_value = pearsonr(x, y)
-            
-            correlations.append({
-                'var1': col1,
-                'var2': col2,
-                'correlation': corr,
-                'p_value': p_value,
-                'significant': p_value < 0.05,
-                'n': len(x),
-                'insight': format_correlation_insight(corr, col1, col2, p_value)
-            })
+    # Get all pairwise correlations in one vectorized pass
+    values = df[metric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    r, p_values, n_pairs = _pairwise_pearson(values)
+    
+    # Upper-triangle pairs with at least 3 complete rows, as parallel arrays
+    rows, cols = np.triu_indices(len(metric_cols), k=1)
+    keep = n_pairs[rows, cols] >= 3
+    
+    result = CorrelationResult(
+        cols=list(metric_cols),
+        r=r,
+        p=p_values,
+        n_pairs=n_pairs,
+        correlation_matrix=corr_matrix,
+        pair_rows=rows[keep],
+        pair_cols=cols[keep]
+    )
+    return result
+
+
+def calculate_simple_correlations(df: pd.DataFrame, 
+                                  metric_cols: list = None,
+                                  top_k: int = None) -> dict:
+    """
+    Calculate all pairwise correlations between metrics
     
-    # Sort by absolute correlation
-    correlations = sorted(correlations, key=lambda x: abs(x['correlation']), reverse=True)
+    Args:
+        df: DataFrame with metric columns
+        metric_cols: List of columns to correlate (default: auto-detect numeric)
+        top_k: Only return the k strongest pairwise correlations (default: all)
+    
+    Returns:
+        Dictionary with correlation matrix and insights
+    """
+    result = compute_correlations(df, metric_cols)
     
+    if result is None:
+        return {}
+    
+    # Strongest first; ties keep pair order, NaN correlations sort last
     return {
-        'correlation_matrix': corr_matrix,
-        'pairwise_correlations': correlations,
-        'metric_columns': metric_cols
+        'correlation_matrix': result.correlation_matrix,
+        'pairwise_correlations': result.pair_dicts(result.strongest(top_k)),
+        'metric_columns': result.cols
     }
 
 
+def _strongest_first(r: np.ndarray, top_k: int = None) -> np.ndarray:
+    """
+    Indices of r ordered by descending absolute value
+    
+    Args:
+        r: 1-D array of correlations
+        top_k: Only order the k strongest entries (default: all)
+    
+    Returns:
+        Index array into r
+    """
+    strength = -np.abs(r)
+    if top_k is None:
+        return np.argsort(strength, kind='stable')
+    
+    top_k = max(top_k, 0)
+    if 0 < top_k < len(r):
+        # Partial selection of the k-th strength, then order just the entries
+        # at or above it (ties included, so the result matches a full sort)
+        kth = np.partition(strength, top_k - 1)[top_k - 1]
+        if not np.isnan(kth):
+            candidates = np.flatnonzero(strength <= kth)
+            return candidates[np.argsort(strength[candidates], kind='stable')][:top_k]
+    return np.argsort(strength, kind='stable')[:top_k]
+
+
+def _pairwise_pearson(values: np.ndarray):
+    """
+    Pearson correlation and p-value for every pair of columns
+    
+    Each pair uses only the rows where both columns are present, matching
+    scipy.stats.pearsonr on the NaN-dropped pair.
+    
+    Args:
+        values: 2-D float array (rows x metrics), NaN for missing values
+    
+    Returns:
+        tuple: (r, p_values, n_pairs) square arrays indexed by column
+    """
+    valid = ~np.isnan(values)
+    n_cols = values.shape[1]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if valid.all():
+            n_pairs = np.full((n_cols, n_cols), len(values))
+            r = np.corrcoef(values, rowvar=False)
+        else:
+            # Center on column means first to limit cancellation in the sums
+            counts = valid.sum(axis=0)
+            means = np.where(valid, values, 0.0).sum(axis=0) / np.maximum(counts, 1)
+            centered = np.where(valid, values - means, 0.0)
+            weights = valid.astype(np.float64)
+            
+            # [i, j] sums run over rows where both column i and column j exist
+            n_pairs = weights.T @ weights
+            sum_x = centered.T @ weights
+            sum_xx = (centered * centered).T @ weights
+            sum_xy = centered.T @ centered
+            
+            cov = sum_xy - sum_x * sum_x.T / n_pairs
+            var = sum_xx - sum_x * sum_x / n_pairs
+            # Variance lost to rounding means the column is constant over
+            # the pair, where pearsonr returns NaN
+            var = np.where(var > sum_xx * 1e-10, var, 0.0)
+            var_product = var * var.T
+            r = np.where(var_product > 0, cov / np.sqrt(var_product), np.nan)
+        
+        r = np.clip(r, -1.0, 1.0)
+        
+        # Two-sided p-value from the t statistic with n - 2 degrees of freedom
+        dof = n_pairs - 2
+        t_stat = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p_values = 2 * stats.t.sf(np.abs(t_stat), dof)
+    
+    return r, p_values, n_pairs
+
+
 def format_correlation_insight(corr: float, var1: str, var2: str, 
                                 p_value: float = None) -> str:
     """
@@ -137,6 +315,7 @@ def format_correlation_insight(corr: float, var1: str, var2: str,
     }
 
 
+@lru_cache(maxsize=256)
 def format_variable_name(var_name: str) -> str:
     """
     Format variable name for display (remove underscores, capitalize)
@@ -147,89 +326,77 @@ def format_variable_name(var_name: str) -> str:
     Returns:
         Formatted name
     """
-    # Common replacements
-    replacements = {
-        'total_cta_rides': 'CTA Ridership',
-        'total_311_complaints': '311 Complaints',
-        'total_crimes': 'Crimes',
-        'total_traffic_volume': 'Traffic Volume',
-        'total_arrests': 'Arrests',
-        'bus_rides': 'Bus Rides',
-        'train_rides': 'Train Rides'
-    }
-    
-    if var_name in replacements:
-        return replacements[var_name]
+    if var_name in _VAR_NAME_REPLACEMENTS:
+        return _VAR_NAME_REPLACEMENTS[var_name]
     
     # Otherwise, format the name
     formatted = var_name.replace('_', ' ').title()
     return formatted
 
 
-def get_top_correlations(df: pd.DataFrame, n: int = 5, 
+def _as_result(data, metric_cols: list = None) -> CorrelationResult:
+    """Accept either a precomputed CorrelationResult or a DataFrame"""
+    if isinstance(data, CorrelationResult):
+        return data
+    return compute_correlations(data, metric_cols)
+
+
+def get_top_correlations(df, n: int = 5, 
                         metric_cols: list = None) -> list:
     """
     Get top N most significant correlations
     
     Args:
-        df: DataFrame with metric columns
+        df: DataFrame with metric columns, or a CorrelationResult from
+            compute_correlations
         n: Number of top correlations to return
-        metric_cols: List of columns to correlate
+        metric_cols: List of columns to correlate (ignored for a CorrelationResult)
     
     Returns:
         List of top correlation dictionaries
     """
-    corr_results = calculate_simple_correlations(df, metric_cols)
+    result = _as_result(df, metric_cols)
     
-    if not corr_results or 'pairwise_correlations' not in corr_results:
+    if result is None:
         return []
     
-    # Filter significant correlations and sort by absolute value
-    significant = [c for c in corr_results['pairwise_correlations'] 
-                   if c['significant']]
+    # Prefer significant correlations, strongest first
+    significant = np.flatnonzero(result.pair_values(result.p) < 0.05)
     
     if len(significant) >= n:
-        return significant[:n]
+        return result.pair_dicts(result.strongest(n, subset=significant))
     else:
         # If not enough significant, return top n by absolute value
-        return corr_results['pairwise_correlations'][:n]
+        return result.pair_dicts(result.strongest(n))
 
 
-def get_correlation_summary(df: pd.DataFrame, 
+def get_correlation_summary(df, 
                             metric_cols: list = None) -> dict:
     """
     Get summary of all correlations with plain language insights
     
     Args:
-        df: DataFrame with metric columns
-        metric_cols: List of columns to correlate
+        df: DataFrame with metric columns, or a CorrelationResult from
+            compute_correlations
+        metric_cols: List of columns to correlate (ignored for a CorrelationResult)
     
     Returns:
         Dictionary with summary statistics and insights
     """
-    corr_results = calculate_simple_correlations(df, metric_cols)
+    result = _as_result(df, metric_cols)
     
-    if not corr_results:
+    if result is None:
         return {}
     
-    correlations = corr_results['pairwise_correlations']
-    
-    # Count by strength
-    strong = sum(1 for c in correlations if abs(c['correlation']) >= 0.7)
-    moderate = sum(1 for c in correlations if 0.4 <= abs(c['correlation']) < 0.7)
-    weak = sum(1 for c in correlations if 0.2 <= abs(c['correlation']) < 0.4)
-    very_weak = sum(1 for c in correlations if abs(c['correlation']) < 0.2)
-    
-    # Count significant
-    significant = sum(1 for c in correlations if c['significant'])
+    strength = np.abs(result.pair_values(result.r))
     
     return {
-        'total_relationships': len(correlations),
-        'strong_relationships': strong,
-        'moderate_relationships': moderate,
-        'weak_relationships': weak,
-        'very_weak_relationships': very_weak,
-        'significant_relationships': significant,
-        'top_insights': [c['insight'] for c in correlations[:3]]
+        'total_relationships': len(strength),
+        # Count by strength (NaN correlations fall in no bucket)
+        'strong_relationships': int(np.count_nonzero(strength >= 0.7)),
+        'moderate_relationships': int(np.count_nonzero((strength >= 0.4) & (strength < 0.7))),
+        'weak_relationships': int(np.count_nonzero((strength >= 0.2) & (strength < 0.4))),
+        'very_weak_relationships': int(np.count_nonzero(strength < 0.2)),
+        'significant_relationships': int(np.count_nonzero(result.pair_values(result.p) < 0.05)),
+        'top_insights': [c['insight'] for c in result.pair_dicts(result.strongest(3))]
     }
-
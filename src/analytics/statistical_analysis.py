@@ -5,12 +5,43 @@ Provides confidence intervals, p-values, effect sizes, and regression analysis
 
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from scipy import stats
-from scipy.stats import pearsonr
 import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Two-sided 95% critical values: t by degrees of freedom (index = dof - 1)
+# and the normal quantile used for Fisher-z intervals
+_T95_MAX_DOF = 10_000
+_T95 = stats.t.ppf(0.975, np.arange(1, _T95_MAX_DOF + 1))
+_Z95 = stats.norm.ppf(0.975)
+
+
+@lru_cache(maxsize=4096)
+def _t_ppf(confidence: float, dof: int) -> float:
+    """Two-sided critical t value, memoized since it needs a root-find"""
+    return float(stats.t.ppf((1 + confidence) / 2, dof))
+
+
+def _t_critical(confidence: float, dof: int) -> float:
+    """Critical t value, from the precomputed table for 95% intervals"""
+    if confidence == 0.95 and 1 <= dof <= _T95_MAX_DOF:
+        return _T95[dof - 1]
+    return _t_ppf(confidence, dof)
+
+
+def _as_float_array(values) -> np.ndarray:
+    """Float64 NumPy view of a Series (missing values as NaN), copying only if needed"""
+    return np.ascontiguousarray(pd.Series(values, copy=False).to_numpy(dtype=np.float64, na_value=np.nan))
+
 
 def calculate_confidence_interval(data: pd.Series, confidence: float = 0.95):
     """
@@ -23,50 +54,129 @@ def calculate_confidence_interval(data: pd.Series, confidence: float = 0.95):
     Returns:
         tuple: (lower_bound, upper_bound, mean)
     """
-    if len(data) < 2:
-        return None, None, data.mean() if len(data) > 0 else None
+    values = _as_float_array(data)
+    present = values[~np.isnan(values)]
+    # Mean of no values is NaN, as with Series.mean()
+    mean = present.mean() if len(present) > 0 else np.nan
     
-    mean = data.mean()
-    std_err = stats.sem(data.dropna())
-    h = std_err * stats.t.ppf((1 + confidence) / 2, len(data) - 1)
+    if len(values) < 2:
+        return None, None, mean if len(values) > 0 else None
+    
+    std_err = present.std(ddof=1) / np.sqrt(len(present)) if len(present) > 1 else np.nan
+    h = std_err * _t_critical(confidence, len(values) - 1)
     
     return mean - h, mean + h, mean
 
 
-def calculate_correlation_with_stats(x: pd.Series, y: pd.Series):
+def _pearson_core(x: np.ndarray, y: np.ndarray):
+    """
+    Single pass over paired values, skipping pairs where either is NaN
+    
+    Uses Welford updates so the sums stay accurate without a second pass.
+    
+    Returns:
+        tuple: (n, mean_x, mean_y, ssx, ssy, sxy) where ss* are the centered
+        sums of squares and sxy the centered cross-product
+    """
+    n = 0
+    mean_x = 0.0
+    mean_y = 0.0
+    ssx = 0.0
+    ssy = 0.0
+    sxy = 0.0
+    for i in range(x.shape[0]):
+        xi = x[i]
+        yi = y[i]
+        if np.isnan(xi) or np.isnan(yi):
+            continue
+        n += 1
+        dx = xi - mean_x
+        dy = yi - mean_y
+        mean_x += dx / n
+        mean_y += dy / n
+        ssx += dx * (xi - mean_x)
+        ssy += dy * (yi - mean_y)
+        sxy += dx * (yi - mean_y)
+    return n, mean_x, mean_y, ssx, ssy, sxy
+
+
+if NUMBA_AVAILABLE:
+    # fastmath is left off: it lets LLVM assume no NaNs and drop the skip test
+    _pearson_core = numba.njit(_pearson_core)
+else:
+    def _pearson_core(x: np.ndarray, y: np.ndarray):
+        """NumPy equivalent of the compiled single-pass kernel"""
+        mask = ~(np.isnan(x) | np.isnan(y))
+        x = x[mask]
+        y = y[mask]
+        n = len(x)
+        if n == 0:
+            return 0, 0.0, 0.0, 0.0, 0.0, 0.0
+        mean_x = x.mean()
+        mean_y = y.mean()
+        dx = x - mean_x
+        dy = y - mean_y
+        return n, mean_x, mean_y, dx @ dx, dy @ dy, dx @ dy
+
+
+def _prep_xy(x: pd.Series, y: pd.Series):
+    """
+    Compute the Pearson correlation and the moments behind it once, so the
+    per-pair statistics below can share the work
+    
+    Args:
+        x: First variable
+        y: Second variable
+    
+    Returns:
+        tuple: (n, corr, p_value, mean_x, mean_y, ssx, ssy, sxy) over the pairs
+        where both values are present; corr and p_value are NaN when fewer
+        than 3 pairs remain
+    """
+    n, *moments = _pearson_core(_as_float_array(x), _as_float_array(y))
+    # NumPy scalars, so division by zero follows the np.errstate guards
+    # below and in the callers instead of raising ZeroDivisionError
+    mean_x, mean_y, ssx, ssy, sxy = map(np.float64, moments)
+    
+    if n < 3:
+        return n, np.nan, np.nan, mean_x, mean_y, ssx, ssy, sxy
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = np.clip(sxy / np.sqrt(ssx * ssy), -1.0, 1.0) if ssx * ssy > 0 else np.float64(np.nan)
+        # Two-sided p-value from t = r * sqrt((n - 2) / (1 - r²)), as pearsonr
+        t_stat = corr * np.sqrt((n - 2) / (1 - corr ** 2))
+    p_value = 2 * stats.t.sf(abs(t_stat), n - 2)
+    return n, corr, p_value, mean_x, mean_y, ssx, ssy, sxy
+
+
+def calculate_correlation_with_stats(x: pd.Series, y: pd.Series, prepared: tuple = None):
     """
     Calculate Pearson correlation with p-value and confidence interval
     
     Args:
         x: First variable
         y: Second variable
+        prepared: Optional result of _prep_xy(x, y) to reuse
     
     Returns:
         dict: Contains correlation, p-value, CI, and significance
     """
-    # Remove NaN pairs
-    mask = ~(x.isna() | y.isna())
-    x_clean = x[mask]
-    y_clean = y[mask]
+    n, corr, p_value = (prepared or _prep_xy(x, y))[:3]
     
-    if len(x_clean) < 3:
+    if n < 3:
         return {
             'correlation': np.nan,
             'p_value': np.nan,
             'ci_lower': np.nan,
             'ci_upper': np.nan,
             'significant': False,
-            'n': len(x_clean)
+            'n': n
         }
     
-    # Calculate correlation and p-value
-    corr, p_value = pearsonr(x_clean, y_clean)
-    
     # Calculate confidence interval using Fisher transformation
-    n = len(x_clean)
     z = np.arctanh(corr)
     se = 1 / np.sqrt(n - 3)
-    z_crit = stats.norm.ppf(0.975)  # 95% CI
+    z_crit = _Z95  # 95% CI
     
     ci_lower = np.tanh(z - z_crit * se)
     ci_upper = np.tanh(z + z_crit * se)
@@ -81,32 +191,27 @@ def calculate_correlation_with_stats(x: pd.Series, y: pd.Series):
     }
 
 
-def calculate_effect_size(x: pd.Series, y: pd.Series):
+def calculate_effect_size(x: pd.Series, y: pd.Series, prepared: tuple = None):
     """
     Calculate effect size (Cohen's d) for correlation
     
     Args:
         x: First variable
         y: Second variable
+        prepared: Optional result of _prep_xy(x, y) to reuse
     
     Returns:
         dict: Contains Cohen's d, R-squared, and interpretation
     """
-    # Remove NaN pairs
-    mask = ~(x.isna() | y.isna())
-    x_clean = x[mask]
-    y_clean = y[mask]
+    n, corr = (prepared or _prep_xy(x, y))[:2]
     
-    if len(x_clean) < 3:
+    if n < 3:
         return {
             'cohens_d': np.nan,
             'r_squared': np.nan,
             'interpretation': 'Insufficient data'
         }
     
-    # Calculate correlation
-    corr, _ = pearsonr(x_clean, y_clean)
-    
     # R-squared
     r_squared = corr ** 2
     
@@ -134,43 +239,67 @@ def calculate_effect_size(x: pd.Series, y: pd.Series):
     }
 
 
-def linear_regression(x: pd.Series, y: pd.Series):
+def linear_regression(x: pd.Series, y: pd.Series, prepared: tuple = None):
     """
     Perform simple linear regression
     
+    The fit reuses the sums behind the Pearson correlation and gives the
+    same results as scipy.stats.linregress, including a flat line through
+    a constant y.
+    
     Args:
         x: Independent variable
         y: Dependent variable
+        prepared: Optional result of _prep_xy(x, y) to reuse
     
     Returns:
         dict: Contains slope, intercept, R², p-value, and statistics
+    
+    Raises:
+        ValueError: If all x values are identical
     """
-    # Remove NaN pairs
-    mask = ~(x.isna() | y.isna())
-    x_clean = x[mask]
-    y_clean = y[mask]
+    n, corr, p_value, mean_x, mean_y, ssx, ssy, sxy = prepared or _prep_xy(x, y)
     
-    if len(x_clean) < 3:
+    if n < 3:
         return {
             'slope': np.nan,
             'intercept': np.nan,
             'r_squared': np.nan,
             'p_value': np.nan,
             'std_err': np.nan,
-            'n': len(x_clean)
+            'n': n
+        }
+    
+    if ssx == 0:
+        raise ValueError("Cannot calculate a linear regression if all x values are identical")
+    
+    if ssy == 0:
+        # Constant y: a flat line through mean_y; the correlation and the
+        # statistics built on it are undefined (NaN)
+        return {
+            'slope': 0.0,
+            'intercept': mean_y,
+            'r_squared': np.nan,
+            'p_value': np.nan,
+            'std_err': np.nan,
+            'n': n,
+            'r_value': np.nan
         }
     
     # Perform regression
-    slope, intercept, r_value, p_value, std_err = stats.linregress(x_clean, y_clean)
+    slope = sxy / ssx
+    # Standard error of the slope with n - 2 degrees of freedom
+    std_err = np.sqrt((1 - corr ** 2) * ssy / ssx / (n - 2))
+    intercept = mean_y - slope * mean_x
     
     return {
         'slope': slope,
         'intercept': intercept,
-        'r_squared': r_value ** 2,
+        'r_squared': corr ** 2,
         'p_value': p_value,
         'std_err': std_err,
-        'n': len(x_clean),
-        'r_value': r_value
+        'n': n,
+        'r_value': corr
     }
 
 
@@ -193,14 +322,17 @@ def calculate_all_statistics(df: pd.DataFrame, x_col: str, y_col: str):
     x = df[x_col]
     y = df[y_col]
     
+    # Skip NaN pairs and correlate once for all three analyses
+    prepared = _prep_xy(x, y)
+    
     # Correlation with stats
-    corr_stats = calculate_correlation_with_stats(x, y)
+    corr_stats = calculate_correlation_with_stats(x, y, prepared)
     
     # Effect size
-    effect_size = calculate_effect_size(x, y)
+    effect_size = calculate_effect_size(x, y, prepared)
     
     # Regression
-    regression = linear_regression(x, y)
+    regression = linear_regression(x, y, prepared)
     
     # Combine results
     results = {
@@ -219,4 +351,3 @@ def calculate_all_statistics(df: pd.DataFrame, x_col: str, y_col: str):
     }
     
     return results
-
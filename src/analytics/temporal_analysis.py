@@ -10,6 +10,95 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Day names indexed by pandas dayofweek (0=Monday, 6=Sunday)
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+                     dtype=object)
+# Month names indexed by month number - 1
+MONTH_NAMES = np.array(['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                        'August', 'September', 'October', 'November', 'December'], dtype=object)
+
+
+def _group_means(df: pd.DataFrame, codes: np.ndarray, n_groups: int,
+                 metric_cols: list):
+    """
+    Per-group means of metric columns for small integer group codes
+    
+    Uses np.bincount sums and counts instead of a hash-based groupby. NaN
+    values are skipped per column, as groupby().mean() does.
+    
+    Args:
+        df: DataFrame with the metric columns
+        codes: Group code per row in [0, n_groups), or -1 to leave the row out
+        n_groups: Number of possible codes
+        metric_cols: Columns to average
+    
+    Returns:
+        tuple: (codes of the groups that have rows, {column: means for those groups})
+    """
+    in_group = codes >= 0
+    codes = codes[in_group]
+    present = np.flatnonzero(np.bincount(codes, minlength=n_groups))
+    
+    means = {}
+    for col in metric_cols:
+        values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)[in_group]
+        has_value = ~np.isnan(values)
+        sums = np.bincount(codes[has_value], weights=values[has_value], minlength=n_groups)
+        counts = np.bincount(codes[has_value], minlength=n_groups)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            means[col] = (sums / counts)[present]
+    
+    return present, means
+
+
+def _as_dates(values: pd.Series) -> pd.Series:
+    """Parse a date column, passing it through if it is already datetime"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors='coerce')
+
+
+def _date_codes(dates: pd.Series, field: str, first: int = 0) -> np.ndarray:
+    """
+    Zero-based integer codes for a calendar field, -1 where NaT
+    
+    Uses the pyarrow compute kernel (pc.day_of_week, pc.month) over the whole
+    column when pyarrow is installed, instead of the pandas .dt accessor.
+    
+    Args:
+        dates: Datetime Series
+        field: 'day_of_week' (0=Monday) or 'month'
+        first: Field value that maps to code 0 (1 for months)
+    
+    Returns:
+        Array of intp codes
+    """
+    if PYARROW_AVAILABLE and pd.api.types.is_datetime64_any_dtype(dates):
+        values = getattr(pc, field)(pa.Array.from_pandas(dates)).fill_null(first - 1)
+        return values.to_numpy().astype(np.intp) - first
+    
+    accessor = 'dayofweek' if field == 'day_of_week' else field
+    return getattr(dates.dt, accessor).fillna(first - 1).to_numpy(dtype=np.intp) - first
+
+
+def _metric_columns(df: pd.DataFrame, exclude: list) -> list:
+    """Numeric (non-timedelta) columns of df in column order, minus exclude"""
+    numeric = df.select_dtypes(include='number', exclude='timedelta').columns
+    return [col for col in numeric if col not in exclude]
+
 
 def analyze_day_of_week_patterns(df: pd.DataFrame, date_col: str = 'date', 
                                  metric_cols: list = None) -> pd.DataFrame:
@@ -28,33 +117,22 @@ def analyze_day_of_week_patterns(df: pd.DataFrame, date_col: str = 'date',
         logger.warning("Empty dataframe or missing date column")
         return pd.DataFrame()
     
-    df_work = df.copy()
-    df_work[date_col] = pd.to_datetime(df_work[date_col], errors='coerce')
-    
-    # Extract day of week (0=Monday, 6=Sunday)
-    df_work['day_of_week'] = df_work[date_col].dt.dayofweek
-    df_work['day_name'] = df_work[date_col].dt.day_name()
+    dates = _as_dates(df[date_col])
     
     # Auto-detect metric columns if not provided
     if metric_cols is None:
-        metric_cols = [col for col in df_work.columns 
-                      if col not in [date_col, 'day_of_week', 'day_name'] 
-                      and df_work[col].dtype in [np.int64, np.float64]]
+        metric_cols = _metric_columns(df, [date_col, 'day_of_week', 'day_name'])
     
     if not metric_cols:
         logger.warning("No numeric metric columns found")
         return pd.DataFrame()
     
-    # Aggregate by day of week
-    agg_dict = {col: 'mean' for col in metric_cols}
-    agg_dict['day_name'] = 'first'  # Keep day name
-    
-    day_patterns = df_work.groupby('day_of_week').agg(agg_dict).reset_index()
-    day_patterns = day_patterns.sort_values('day_of_week')
+    # Aggregate by day of week (0=Monday, 6=Sunday); names are added after
+    # aggregating, so only 7 strings are built instead of one per row
+    days, means = _group_means(df, _date_codes(dates, 'day_of_week'), 7, metric_cols)
     
-    # Add day names in order
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    day_patterns['day_name'] = [day_order[int(dow)] for dow in day_patterns['day_of_week']]
+    day_patterns = pd.DataFrame({'day_of_week': days, **means})
+    day_patterns['day_name'] = DAY_NAMES[days]
     
     return day_patterns
 
@@ -76,34 +154,30 @@ def analyze_time_patterns(df: pd.DataFrame, date_col: str = 'date',
         logger.warning("Empty dataframe or missing date column")
         return pd.DataFrame()
     
-    df_work = df.copy()
-    df_work[date_col] = pd.to_datetime(df_work[date_col], errors='coerce')
-    
-    # Check if hour data is available
-    if 'hour' in df_work.columns or any('hour' in str(col).lower() for col in df_work.columns):
+    # Check if hour data is available (first column with 'hour' in its name)
+    hour_col = next((col for col in df.columns if 'hour' in str(col).lower()), None)
+    if hour_col is not None:
         # Analyze by hour
-        hour_col = [col for col in df_work.columns if 'hour' in str(col).lower()][0]
-        df_work['time_period'] = df_work[hour_col]
+        codes, periods = pd.factorize(df[hour_col], sort=True)
         period_type = 'hour'
     else:
-        # Analyze by weekday vs weekend
-        df_work['is_weekend'] = df_work[date_col].dt.dayofweek >= 5
-        df_work['time_period'] = df_work['is_weekend'].map({True: 'Weekend', False: 'Weekday'})
+        # Analyze by weekday vs weekend (unparseable dates count as weekdays)
+        dates = _as_dates(df[date_col])
+        codes = (_date_codes(dates, 'day_of_week') >= 5).astype(np.intp)
+        periods = np.array(['Weekday', 'Weekend'], dtype=object)
         period_type = 'weekday_weekend'
     
     # Auto-detect metric columns if not provided
     if metric_cols is None:
-        metric_cols = [col for col in df_work.columns 
-                      if col not in [date_col, 'time_period', 'is_weekend', 'hour'] 
-                      and df_work[col].dtype in [np.int64, np.float64]]
+        metric_cols = _metric_columns(df, [date_col, 'time_period', 'is_weekend', 'hour'])
     
     if not metric_cols:
         logger.warning("No numeric metric columns found")
         return pd.DataFrame()
     
     # Aggregate by time period
-    agg_dict = {col: 'mean' for col in metric_cols}
-    time_patterns = df_work.groupby('time_period').agg(agg_dict).reset_index()
+    present, means = _group_means(df, codes, len(periods), metric_cols)
+    time_patterns = pd.DataFrame({'time_period': np.asarray(periods)[present], **means})
     
     return time_patterns
 
@@ -143,6 +217,100 @@ def get_peak_days(df: pd.DataFrame, metric_col: str,
     }
 
 
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True)
+    def _peak_stats(values: np.ndarray):
+        """
+        Position of the max and min and the mean of each column, skipping NaN
+        
+        Columns are processed in parallel; positions are -1 for all-NaN columns.
+        """
+        n_rows, n_cols = values.shape
+        peak = np.full(n_cols, -1, dtype=np.int64)
+        low = np.full(n_cols, -1, dtype=np.int64)
+        mean = np.full(n_cols, np.nan)
+        for j in numba.prange(n_cols):
+            total = 0.0
+            count = 0
+            for i in range(n_rows):
+                value = values[i, j]
+                if np.isnan(value):
+                    continue
+                # Strict comparisons keep the first occurrence, as idxmax/idxmin do
+                if count == 0 or value > values[peak[j], j]:
+                    peak[j] = i
+                if count == 0 or value < values[low[j], j]:
+                    low[j] = i
+                total += value
+                count += 1
+            if count > 0:
+                mean[j] = total / count
+        return peak, low, mean
+else:
+    def _peak_stats(values: np.ndarray):
+        """NumPy equivalent of the compiled per-column peak/low/mean kernel"""
+        missing = np.isnan(values)
+        counts = (~missing).sum(axis=0)
+        peak = np.where(counts > 0, np.argmax(np.where(missing, -np.inf, values), axis=0), -1)
+        low = np.where(counts > 0, np.argmin(np.where(missing, np.inf, values), axis=0), -1)
+        with np.errstate(invalid='ignore'):
+            mean = np.nansum(values, axis=0) / counts
+        return peak, low, mean
+
+
+def get_peak_days_batch(df: pd.DataFrame, metric_cols: list,
+                        day_col: str = 'day_name') -> dict:
+    """
+    Identify peak and low days for several metrics at once
+    
+    Same statistics as get_peak_days, computed for all metrics in one pass
+    over the (periods x metrics) array instead of one pandas call per metric.
+    
+    Args:
+        df: DataFrame with day patterns
+        metric_cols: Names of metric columns
+        day_col: Name of day name column
+    
+    Returns:
+        Dictionary mapping each metric column to its get_peak_days dictionary
+        (empty for columns that are missing or have no values)
+    """
+    peaks = {col: {} for col in metric_cols}
+    cols = [col for col in metric_cols if col in df.columns]
+    if df.empty or not cols:
+        return peaks
+    
+    if day_col not in df.columns:
+        day_col = df.columns[0]  # Fallback to first column
+    
+    values = np.asfortranarray(df[cols].to_numpy(dtype=np.float64, na_value=np.nan))
+    peak_pos, low_pos, avg_values = _peak_stats(values)
+    days = df[day_col].to_numpy()
+    
+    # Percent differences for all metrics at once; 0 where the average is not positive
+    positive = avg_values > 0
+    safe_avg = np.where(positive, avg_values, 1.0)
+    peak_values = values[peak_pos, np.arange(len(cols))]
+    low_values = values[low_pos, np.arange(len(cols))]
+    peak_pct = np.where(positive, (peak_values / safe_avg - 1) * 100, 0)
+    low_pct = np.where(positive, (1 - low_values / safe_avg) * 100, 0)
+    
+    for j, col in enumerate(cols):
+        if peak_pos[j] < 0:
+            continue
+        peaks[col] = {
+            'peak_day': days[peak_pos[j]],
+            'peak_value': peak_values[j],
+            'low_day': days[low_pos[j]],
+            'low_value': low_values[j],
+            'avg_value': avg_values[j],
+            'peak_pct_above_avg': peak_pct[j],
+            'low_pct_below_avg': low_pct[j]
+        }
+    
+    return peaks
+
+
 def format_temporal_insight(day: str, value: float, metric_name: str, 
                            avg_value: float, is_peak: bool = True) -> str:
     """
@@ -169,6 +337,56 @@ def format_temporal_insight(day: str, value: float, metric_name: str,
         return f"{day} has {pct_diff:.0f}% fewer {metric_name} than average ({value:,.0f} vs {avg_value:,.0f})"
 
 
+def format_temporal_insights(days, values, metric_names, avg_values,
+                             is_peak=True) -> list:
+    """
+    Create plain-language insights for many periods or metrics at once
+    
+    Percent differences are computed for all entries in one NumPy step and
+    each distinct number is formatted only once.
+    
+    Args:
+        days: Day names or time periods
+        values: Value for each day/period
+        metric_names: Metric name per entry, or one name for all
+        avg_values: Average per entry, or one average for all
+        is_peak: Peak (True) or low (False), per entry or for all
+    
+    Returns:
+        List of insight strings, as format_temporal_insight would build them
+    """
+    days = np.asarray(days, dtype=object)
+    n = len(days)
+    values = np.broadcast_to(np.asarray(values, dtype=np.float64), (n,))
+    avg_values = np.broadcast_to(np.asarray(avg_values, dtype=np.float64), (n,))
+    metric_names = np.broadcast_to(np.asarray(metric_names, dtype=object), (n,))
+    is_peak = np.broadcast_to(np.asarray(is_peak, dtype=bool), (n,))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = values / avg_values
+    pct_diffs = np.where(is_peak, (ratio - 1) * 100, (1 - ratio) * 100)
+    
+    formatted = {}
+    
+    def amount(number):
+        text = formatted.get(number)
+        if text is None:
+            text = formatted[number] = f"{number:,.0f}"
+        return text
+    
+    insights = []
+    for day, value, name, avg_value, peak, pct_diff in zip(
+            days, values.tolist(), metric_names, avg_values.tolist(), is_peak, pct_diffs.tolist()):
+        if avg_value == 0:
+            insights.append(f"{day} has {amount(value)} {name}")
+        else:
+            direction = 'more' if peak else 'fewer'
+            insights.append(f"{day} has {pct_diff:.0f}% {direction} {name} than average "
+                            f"({amount(value)} vs {amount(avg_value)})")
+    
+    return insights
+
+
 def get_seasonal_patterns(df: pd.DataFrame, date_col: str = 'date',
                           metric_cols: list = None) -> pd.DataFrame:
     """
@@ -186,27 +404,22 @@ def get_seasonal_patterns(df: pd.DataFrame, date_col: str = 'date',
         logger.warning("Empty dataframe or missing date column")
         return pd.DataFrame()
     
-    df_work = df.copy()
-    df_work[date_col] = pd.to_datetime(df_work[date_col], errors='coerce')
-    df_work['month'] = df_work[date_col].dt.month
-    df_work['month_name'] = df_work[date_col].dt.strftime('%B')
+    dates = _as_dates(df[date_col])
     
     # Auto-detect metric columns if not provided
     if metric_cols is None:
-        metric_cols = [col for col in df_work.columns 
-                      if col not in [date_col, 'month', 'month_name'] 
-                      and df_work[col].dtype in [np.int64, np.float64]]
+        metric_cols = _metric_columns(df, [date_col, 'month', 'month_name'])
     
     if not metric_cols:
         logger.warning("No numeric metric columns found")
         return pd.DataFrame()
     
-    # Aggregate by month
-    agg_dict = {col: 'mean' for col in metric_cols}
-    agg_dict['month_name'] = 'first'
+    # Aggregate by month (codes 0-11)
+    months, means = _group_means(df, _date_codes(dates, 'month', first=1), 12, metric_cols)
+    
+    seasonal_patterns = pd.DataFrame({'month': months + 1, **means})
     
-    seasonal_patterns = df_work.groupby('month').agg(agg_dict).reset_index()
-    seasonal_patterns = seasonal_patterns.sort_values('month')
+    # Name the (at most 12) months after aggregating rather than per row
+    seasonal_patterns['month_name'] = MONTH_NAMES[months]
     
     return seasonal_patterns
-
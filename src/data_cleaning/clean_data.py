@@ -8,14 +8,26 @@ import numpy as np
 import logging
 from datetime import datetime
 from typing import Optional
+from pandas.api.types import (is_bool_dtype, is_datetime64_any_dtype, is_integer_dtype,
+                              is_numeric_dtype, is_object_dtype, is_string_dtype)
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
+from geopy.extra.rate_limiter import RateLimiter
+import os
 import time
+import shelve
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
 from pathlib import Path
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Get project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Geocoding results from earlier runs, keyed by address (see geocode_addresses)
+GEOCODE_CACHE_PATH = PROJECT_ROOT / "data" / "cache" / "geocode_cache"
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,25 +35,65 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = (
+    'data_collection.collect_311_data',
+    'data_collection.collect_cta_data',
+    'data_collection.collect_traffic_data',
+    'data_collection.collect_crime_data',
+)
+
+# The collectors save Socrata API timestamps verbatim
+# (e.g. 2024-01-31T08:15:00.000), so known columns parse as ISO 8601
+SOCRATA_TIMESTAMP_FORMAT = 'ISO8601'
+
+# Low-cardinality label columns stored as category (integer codes plus one
+# copy of each label) in memory and in the Parquet output
+CATEGORY_COLUMNS = ('service_request_type', 'sr_type', 'ward', 'community_area',
+                    'mode', 'route', 'primary_type', 'location_description')
+
+# Arrow-backed string dtype with NaN for missing values: the default 'str'
+# on pandas 3, opted into on pandas 2.1+ where text otherwise loads as object
+try:
+    ARROW_STRING_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+except TypeError:
+    try:
+        ARROW_STRING_DTYPE = pd.StringDtype('pyarrow_numpy')
+    except (TypeError, ValueError):
+        ARROW_STRING_DTYPE = None
+
 
-def normalize_timestamps(df: pd.DataFrame, date_columns: list) -> pd.DataFrame:
+def normalize_timestamps(df: pd.DataFrame, date_columns: list, inplace: bool = False,
+                         formats: Optional[dict] = None) -> pd.DataFrame:
     """
     Normalize timestamp columns to datetime format
     
     Args:
         df: DataFrame to process
         date_columns: List of column names that contain dates
+        inplace: Modify df directly instead of working on a copy
+        formats: Optional {column: format} for columns with a known layout;
+                 other columns fall back to format inference
     
     Returns:
         DataFrame with normalized timestamps
     """
-    df_clean = df.copy()
+    df_clean = df if inplace else df.copy()
+    formats = formats or {}
     
     for col in date_columns:
         if col in df_clean.columns:
+            if is_datetime64_any_dtype(df_clean[col]):
+                # Already parsed when the raw CSV was read
+                continue
             try:
-                # Try to parse as datetime
-                df_clean[col] = pd.to_datetime(df_clean[col], errors='coerce')
+                # Parse as datetime; cache=True converts each distinct string once
+                fmt = formats.get(col)
+                parsed = pd.to_datetime(df_clean[col], format=fmt, cache=True, errors='coerce')
+                if fmt and (parsed.isna() & df_clean[col].notna()).any():
+                    # Values that don't match the expected layout: infer instead
+                    parsed = pd.to_datetime(df_clean[col], cache=True, errors='coerce')
+                df_clean[col] = parsed
                 logger.info(f"Normalized {col} to datetime format")
             except Exception as e:
                 logger.warning(f"Could not normalize {col}: {e}")
@@ -49,58 +101,95 @@ def normalize_timestamps(df: pd.DataFrame, date_columns: list) -> pd.DataFrame:
     return df_clean
 
 
-def handle_missing_values(df: pd.DataFrame, strategy: str = 'drop') -> pd.DataFrame:
+def _calendar_date(values: pd.Series) -> pd.Series:
+    """
+    Truncate a timestamp column to its calendar date
+    
+    Columns already parsed by normalize_timestamps are not parsed again, and
+    the result stays datetime64 instead of boxing one datetime.date per row.
+    
+    Args:
+        values: Timestamp column (parsed or raw)
+    
+    Returns:
+        datetime64 Series at midnight of each date (NaT where unparseable)
+    """
+    if not is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, errors='coerce')
+    return values.dt.normalize()
+
+
+def _is_nan_string_dtype(dtype) -> bool:
+    """True for the NaN-backed string dtype (pandas 3 default 'str')"""
+    return isinstance(dtype, pd.StringDtype) and dtype.na_value is np.nan
+
+
+def handle_missing_values(df: pd.DataFrame, strategy: str = 'drop', inplace: bool = False) -> pd.DataFrame:
     """
     Handle missing values in DataFrame
     
     Args:
         df: DataFrame to process
         strategy: 'drop' to drop rows with missing values, 'fill' to fill with defaults
+        inplace: Modify df directly instead of working on a copy
     
     Returns:
         DataFrame with handled missing values
     """
-    df_clean = df.copy()
+    df_clean = df if inplace else df.copy()
     
     initial_count = len(df_clean)
     
     if strategy == 'drop':
         # Drop rows where all key columns are missing
         # Keep rows with partial data
-        df_clean = df_clean.dropna(how='all')
+        df_clean.dropna(how='all', inplace=True)
         logger.info(f"Dropped {initial_count - len(df_clean)} rows with all missing values")
     elif strategy == 'fill':
-        # Fill numeric columns with 0, string columns with empty string
-        numeric_cols = df_clean.select_dtypes(include=[np.number]).columns
-        string_cols = df_clean.select_dtypes(include=['object']).columns
+        # Fill numeric columns with 0, string columns with empty string.
+        # One pass over the dtypes picks the same columns as
+        # select_dtypes(include=[np.number]) and select_dtypes(include=['object'])
+        fill_values = {}
+        for col, dtype in df_clean.dtypes.items():
+            if (is_numeric_dtype(dtype) and not is_bool_dtype(dtype)) or dtype.kind == 'm':
+                fill_values[col] = 0
+            elif is_object_dtype(dtype) or _is_nan_string_dtype(dtype):
+                fill_values[col] = ''
+            elif isinstance(dtype, pd.CategoricalDtype) and is_string_dtype(dtype.categories):
+                # Text encoded by encode_categories; '' must be a category to fill with it
+                fill_values[col] = ''
         
-        df_clean[numeric_cols] = df_clean[numeric_cols].fillna(0)
-        df_clean[string_cols] = df_clean[string_cols].fillna('')
+        # Replace only the columns that have gaps rather than filling in
+        # place, so a shallow copy never writes into its source's arrays
+        for col, value in fill_values.items():
+            if df_clean[col].hasnans:
+                column = df_clean[col]
+                if isinstance(column.dtype, pd.CategoricalDtype) and value not in column.cat.categories:
+                    column = column.cat.add_categories([value])
+                df_clean[col] = column.fillna(value)
         
         logger.info("Filled missing values with defaults")
     
     return df_clean
 
 
-def remove_duplicates(df: pd.DataFrame, subset: Optional[list] = None) -> pd.DataFrame:
+def remove_duplicates(df: pd.DataFrame, subset: Optional[list] = None, inplace: bool = False) -> pd.DataFrame:
     """
     Remove duplicate rows from DataFrame
     
     Args:
         df: DataFrame to process
         subset: List of columns to consider for duplicates (None = all columns)
+        inplace: Modify df directly instead of working on a copy
     
     Returns:
         DataFrame with duplicates removed
     """
-    df_clean = df.copy()
+    df_clean = df if inplace else df.copy()
     
     initial_count = len(df_clean)
     
-    if subset:
-        df_clean = df_clean.drop_duplicates(subset=subset)
-    else:
-        df_clean = df_clean.drop_duplicates()
+    df_clean.drop_duplicates(subset=subset or None, inplace=True)
     
     removed = initial_count - len(df_clean)
     if removed > 0:
@@ -109,91 +198,291 @@ def remove_duplicates(df: pd.DataFrame, subset: Optional[list] = None) -> pd.Dat
     return df_clean
 
 
-def normalize_locations(df: pd.DataFrame, location_column: str) -> pd.DataFrame:
+def standardize_column_names(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lowercase column names and replace spaces with underscores, in place
+    
+    Socrata field names are already in this form, so usually the columns
+    are left untouched and no new Index is built.
+    
+    Args:
+        df: DataFrame to modify
+    
+    Returns:
+        The same DataFrame
+    """
+    columns = [str(col).lower().replace(' ', '_') for col in df.columns]
+    if columns != list(df.columns):
+        df.columns = columns
+    return df
+
+
+def use_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store text columns held as Python objects as Arrow-backed strings, in place
+    
+    String methods and comparisons then run as Arrow kernels over one
+    contiguous buffer instead of per Python object, and the text takes far
+    less memory. Object columns mixing strings with other values are left
+    as they are, and so is everything on pandas versions without the dtype.
+    
+    Args:
+        df: DataFrame to modify
+    
+    Returns:
+        The same DataFrame
+    """
+    if ARROW_STRING_DTYPE is None:
+        return df
+    for col, dtype in df.dtypes.items():
+        if is_object_dtype(dtype) and pd.api.types.infer_dtype(df[col], skipna=True) == 'string':
+            df[col] = df[col].astype(ARROW_STRING_DTYPE)
+    return df
+
+
+def encode_categories(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    Convert repeated string columns to category dtype in place
+    
+    Grouping and duplicate checks then compare integer codes instead of
+    hashing every string. Non-string columns are left unchanged.
+    
+    Args:
+        df: DataFrame to modify
+        columns: Columns to convert if present and string-typed
+    
+    Returns:
+        The same DataFrame
+    """
+    for col in columns:
+        if col in df.columns and is_string_dtype(df[col]) and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def coerce_counts(df: pd.DataFrame, columns: list, downcast: bool = True) -> pd.DataFrame:
+    """
+    Make count columns numeric in place, filling unparseable or missing with 0
+    
+    Columns holding only whole numbers are stored as int32 (int64 if they
+    do not fit) instead of float64, halving their size in later steps and
+    in the cleaned Parquet file. Columns with fractions stay float64.
+    
+    Args:
+        df: DataFrame to modify
+        columns: Count columns to convert if present
+        downcast: Choose the dtype from the values as above. If False, integer
+            columns become int64 and all others float64, so every chunk of a
+            file gets the same dtype whatever its values
+    
+    Returns:
+        The same DataFrame
+    """
+    cols = [col for col in columns if col in df.columns]
+    if not cols:
+        return df
+    
+    counts = df[cols].apply(pd.to_numeric, errors='coerce').fillna(0)
+    if not downcast:
+        for col in cols:
+            df[col] = counts[col].astype(np.int64 if is_integer_dtype(df[col]) else np.float64)
+        return df
+    
+    for col in cols:
+        values = pd.to_numeric(counts[col], downcast='integer')
+        # Keep at least int32 so sums and arithmetic downstream cannot overflow
+        if values.dtype.kind == 'i' and values.dtype.itemsize < 4:
+            values = values.astype(np.int32)
+        df[col] = values
+    return df
+
+
+def drop_duplicate_and_empty_rows(df: pd.DataFrame, subset: Optional[list] = None) -> pd.DataFrame:
+    """
+    Remove duplicate rows and rows with every value missing in one pass
+    
+    Same result as remove_duplicates followed by handle_missing_values with
+    strategy='drop', but the kept rows are materialized once instead of twice.
+    
+    Args:
+        df: DataFrame to process
+        subset: List of columns to consider for duplicates (None = all columns)
+    
+    Returns:
+        DataFrame without duplicate or all-missing rows
+    """
+    duplicated = df.duplicated(subset=subset or None)
+    empty = df.isna().all(axis=1)
+    
+    if duplicated.any():
+        logger.info(f"Removed {int(duplicated.sum())} duplicate rows")
+    logger.info(f"Dropped {int((empty & ~duplicated).sum())} rows with all missing values")
+    
+    keep = ~(duplicated | empty)
+    return df if keep.all() else df[keep]
+
+
+def geocode_addresses(addresses: list, cache_path: Path = GEOCODE_CACHE_PATH) -> dict:
+    """
+    Look up coordinates for Chicago street addresses through Nominatim
+    
+    Each address is geocoded at most once across runs: results (including
+    "not found") are kept in a shelve cache on disk, and only addresses
+    missing from it are sent, at Nominatim's limit of one request per
+    second. Requests that time out or fail are not cached, so a later run
+    retries them.
+    
+    Args:
+        addresses: Distinct address strings
+        cache_path: Shelve file holding earlier results
+    
+    Returns:
+        Dict of address -> (latitude, longitude); (None, None) if unknown
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    coords = {}
+    
+    with shelve.open(str(cache_path)) as cache:
+        missing = [address for address in addresses if address not in cache]
+        if missing:
+            logger.info(f"Geocoding {len(missing)} new addresses "
+                        f"({len(addresses) - len(missing)} cached)")
+            geolocator = Nominatim(user_agent='cta-eac/1.0')
+            geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1, swallow_exceptions=False)
+        
+        for address in missing:
+            try:
+                location = geocode(f"{address}, Chicago, IL")
+            except (GeocoderTimedOut, GeocoderServiceError) as e:
+                logger.warning(f"Could not geocode '{address}': {e}")
+                coords[address] = (None, None)
+                continue
+            cache[address] = (location.latitude, location.longitude) if location else (None, None)
+        
+        for address in addresses:
+            if address not in coords:
+                coords[address] = cache[address]
+    
+    return coords
+
+
+def normalize_locations(df: pd.DataFrame, location_column: str, inplace: bool = False,
+                        geocode: bool = False) -> pd.DataFrame:
     """
     Normalize location data to latitude/longitude (if possible)
-    Note: This is a simplified version. Full geocoding requires API keys.
+    Note: Geocoding is opt-in; it calls the public Nominatim service.
     
     Args:
         df: DataFrame to process
         location_column: Name of column containing location data
+        inplace: Modify df directly instead of working on a copy
+        geocode: Fill missing latitude/longitude by geocoding the addresses
+                 through Nominatim (slow on first run; see geocode_addresses)
     
     Returns:
         DataFrame with normalized location data
     """
-    df_clean = df.copy()
+    df_clean = df if inplace else df.copy()
     
     if location_column not in df_clean.columns:
         logger.warning(f"Location column '{location_column}' not found")
         return df_clean
     
-    # Add latitude and longitude columns if they don't exist
-    if 'latitude' not in df_clean.columns:
-        df_clean['latitude'] = np.nan
-    if 'longitude' not in df_clean.columns:
-        df_clean['longitude'] = np.nan
+    if not geocode:
+        # No geocoder is configured, so there is nothing to fill in; adding
+        # all-NaN latitude/longitude columns would only cost memory downstream
+        logger.info("Location normalization skipped: full geocoding requires external API.")
+        return df_clean
+    
+    # Addresses repeat heavily (e.g. outages at one intersection), so geocode
+    # each distinct one once and spread the results back through the codes
+    codes, uniques = pd.factorize(df_clean[location_column])
+    addresses = [str(address) for address in uniques]
+    coords = geocode_addresses(addresses)
+    # Trailing NaN is picked by code -1 (missing address)
+    lat = np.array([coords[address][0] for address in addresses] + [np.nan], dtype=float)[codes]
+    lon = np.array([coords[address][1] for address in addresses] + [np.nan], dtype=float)[codes]
+    
+    for col, values in (('latitude', lat), ('longitude', lon)):
+        if col in df_clean.columns:
+            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(
+                pd.Series(values, index=df_clean.index))
+        else:
+            df_clean[col] = values
     
-    # If location data is already in lat/lon format, extract it
-    # This is a simplified approach - full geocoding would require external services
-    logger.info("Location normalization: Basic structure added. Full geocoding requires external API.")
+    logger.info(f"Geocoded {len(addresses)} distinct locations for {len(df_clean)} rows")
     
     return df_clean
 
 
-def clean_311_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_311_data(df: pd.DataFrame, streaming: bool = False,
+                   geocode: bool = False) -> pd.DataFrame:
     """
     Clean Chicago 311 service request data
     
     Args:
         df: Raw 311 DataFrame
+        streaming: df is one chunk of a larger file (no effect: no dtype
+            here depends on the chunk's values)
+        geocode: Fill missing latitude/longitude from the street address
+            through Nominatim (see normalize_locations)
     
     Returns:
         Cleaned DataFrame
     """
     logger.info("Cleaning 311 data")
-    df_clean = df.copy()
+    # Shallow copy: timestamp parsing replaces whole columns, so the caller's
+    # data is never written to and untouched columns are never duplicated
+    df_clean = df.copy(deep=False)
+    
+    # Standardize column names first (lowercase, spaces to underscores) so
+    # the steps below find e.g. "Created Date" as created_date
+    standardize_column_names(df_clean)
+    encode_categories(df_clean, CATEGORY_COLUMNS)
     
     # Normalize timestamps
     date_cols = ['created_date', 'updated_date', 'closed_date', 'sr_date']
-    df_clean = normalize_timestamps(df_clean, date_cols)
+    df_clean = normalize_timestamps(df_clean, date_cols, inplace=True,
+                                    formats=dict.fromkeys(date_cols, SOCRATA_TIMESTAMP_FORMAT))
     
-    # Remove duplicates based on service request number
-    if 'service_request_number' in df_clean.columns:
-        df_clean = remove_duplicates(df_clean, subset=['service_request_number'])
-    else:
-        df_clean = remove_duplicates(df_clean)
+    # Remove duplicates (based on service request number) and all-missing
+    # rows with a single row filter
+    subset = ['service_request_number'] if 'service_request_number' in df_clean.columns else None
+    df_clean = drop_duplicate_and_empty_rows(df_clean, subset=subset)
     
-    # Handle missing values
-    df_clean = handle_missing_values(df_clean, strategy='drop')
-    
-    # Standardize column names (convert to lowercase, replace spaces with underscores)
-    df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
-    
-    # Normalize locations if coordinates exist
-    if 'latitude' in df_clean.columns or 'longitude' in df_clean.columns:
-        df_clean = normalize_locations(df_clean, 'location')
+    if geocode:
+        df_clean = normalize_locations(df_clean, 'street_address', inplace=True, geocode=True)
     
     logger.info(f"Cleaned 311 data: {len(df_clean)} records")
     
     return df_clean
 
 
-def clean_cta_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_cta_data(df: pd.DataFrame, streaming: bool = False) -> pd.DataFrame:
     """
     Clean CTA ridership data
     
     Args:
         df: Raw CTA DataFrame
+        streaming: df is one chunk of a larger file, so count dtypes must not
+            depend on the chunk's values
     
     Returns:
         Cleaned DataFrame
     """
     logger.info("Cleaning CTA ridership data")
-    df_clean = df.copy()
+    # Shallow copy, as in clean_311_data: the steps below only replace whole
+    # columns or rows
+    df_clean = df.copy(deep=False)
+    
+    # Standardize column names first
+    standardize_column_names(df_clean)
+    encode_categories(df_clean, CATEGORY_COLUMNS)
     
     # Normalize timestamps
     date_cols = ['date', 'service_date', 'daytype']
-    df_clean = normalize_timestamps(df_clean, date_cols)
+    df_clean = normalize_timestamps(df_clean, date_cols, inplace=True,
+                                    formats=dict.fromkeys(['date', 'service_date'], SOCRATA_TIMESTAMP_FORMAT))
     
     # Remove duplicates
     if 'date' in df_clean.columns:
@@ -203,102 +492,104 @@ def clean_cta_data(df: pd.DataFrame) -> pd.DataFrame:
             subset.append('station_id')
         if 'route' in df_clean.columns:
             subset.append('route')
-        df_clean = remove_duplicates(df_clean, subset=subset)
+        # mode/station/route repeat on every row, so dedup on dictionary codes
+        encode_categories(df_clean, subset)
+        df_clean = remove_duplicates(df_clean, subset=subset, inplace=True)
     else:
-        df_clean = remove_duplicates(df_clean)
+        df_clean = remove_duplicates(df_clean, inplace=True)
     
     # Handle missing values
-    df_clean = handle_missing_values(df_clean, strategy='fill')
-    
-    # Standardize column names
-    df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
+    df_clean = handle_missing_values(df_clean, strategy='fill', inplace=True)
     
-    # Ensure numeric columns are numeric
-    numeric_cols = ['rides', 'boardings', 'alightings']
-    for col in numeric_cols:
-        if col in df_clean.columns:
-            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
+    # Ensure ridership counts are numeric (whole counts as int32)
+    coerce_counts(df_clean, ['rides', 'boardings', 'alightings'], downcast=not streaming)
     
     logger.info(f"Cleaned CTA data: {len(df_clean)} records")
     
     return df_clean
 
 
-def clean_traffic_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_traffic_data(df: pd.DataFrame, streaming: bool = False) -> pd.DataFrame:
     """
     Clean traffic volume data
     
     Args:
         df: Raw traffic DataFrame
+        streaming: df is one chunk of a larger file, so count dtypes must not
+            depend on the chunk's values
     
     Returns:
         Cleaned DataFrame
     """
     logger.info("Cleaning traffic volume data")
-    df_clean = df.copy()
+    # Shallow copy, as in clean_311_data: the steps below only replace whole
+    # columns or rows
+    df_clean = df.copy(deep=False)
     
     # Standardize column names first
-    df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
+    standardize_column_names(df_clean)
     
     # Normalize timestamps - use 'time' column from Traffic Tracker dataset
     date_cols = ['time', 'date', 'time_of_day']
-    df_clean = normalize_timestamps(df_clean, date_cols)
+    df_clean = normalize_timestamps(df_clean, date_cols, inplace=True,
+                                    formats=dict.fromkeys(['time', 'date'], SOCRATA_TIMESTAMP_FORMAT))
     
     # Remove duplicates
-    df_clean = remove_duplicates(df_clean)
+    df_clean = remove_duplicates(df_clean, inplace=True)
     
     # Handle missing values
-    df_clean = handle_missing_values(df_clean, strategy='fill')
+    df_clean = handle_missing_values(df_clean, strategy='fill', inplace=True)
     
-    # Ensure numeric columns are numeric
-    numeric_cols = ['speed', 'bus_count', 'message_count', 'volume', 'count']
-    for col in numeric_cols:
-        if col in df_clean.columns:
-            df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
+    # Ensure numeric columns are numeric (whole counts as int32)
+    if 'speed' in df_clean.columns:
+        df_clean['speed'] = pd.to_numeric(df_clean['speed'], errors='coerce').fillna(0)
+    coerce_counts(df_clean, ['bus_count', 'message_count', 'volume', 'count'], downcast=not streaming)
     
     # Extract date for aggregation - use 'time' column if available
     if 'time' in df_clean.columns:
-        df_clean['date'] = pd.to_datetime(df_clean['time'], errors='coerce').dt.date
+        df_clean['date'] = _calendar_date(df_clean['time'])
     elif 'date' in df_clean.columns:
-        df_clean['date'] = pd.to_datetime(df_clean['date'], errors='coerce').dt.date
+        df_clean['date'] = _calendar_date(df_clean['date'])
     
     logger.info(f"Cleaned traffic data: {len(df_clean)} records")
     
     return df_clean
 
 
-def clean_crime_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_crime_data(df: pd.DataFrame, streaming: bool = False) -> pd.DataFrame:
     """
     Clean crime data
     
     Args:
         df: Raw crime DataFrame
+        streaming: df is one chunk of a larger file (no effect: no dtype
+            here depends on the chunk's values)
     
     Returns:
         Cleaned DataFrame
     """
     logger.info("Cleaning crime data")
-    df_clean = df.copy()
+    # Shallow copy, as in clean_311_data: the steps below only replace whole
+    # columns or rows
+    df_clean = df.copy(deep=False)
+    
+    # Standardize column names first
+    standardize_column_names(df_clean)
+    encode_categories(df_clean, CATEGORY_COLUMNS)
     
     # Normalize timestamps
     date_cols = ['date', 'updated_on']
-    df_clean = normalize_timestamps(df_clean, date_cols)
-    
-    # Remove duplicates based on case_number
-    if 'case_number' in df_clean.columns:
-        df_clean = remove_duplicates(df_clean, subset=['case_number'])
-    else:
-        df_clean = remove_duplicates(df_clean)
-    
-    # Handle missing values
-    df_clean = handle_missing_values(df_clean, strategy='drop')
+    df_clean = normalize_timestamps(df_clean, date_cols, inplace=True,
+                                    formats=dict.fromkeys(date_cols, SOCRATA_TIMESTAMP_FORMAT))
     
-    # Standardize column names
-    df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
+    # Remove duplicates (based on case_number) and all-missing rows with a
+    # single row filter, as in clean_311_data
+    subset = ['case_number'] if 'case_number' in df_clean.columns else None
+    df_clean = drop_duplicate_and_empty_rows(df_clean, subset=subset)
     
     # Extract date for aggregation
     if 'date' in df_clean.columns:
-        df_clean['date'] = pd.to_datetime(df_clean['date'], errors='coerce').dt.date
+        df_clean['date'] = _calendar_date(df_clean['date'])
     
     # Ensure arrest column is boolean/numeric
     if 'arrest' in df_clean.columns:
@@ -309,71 +600,431 @@ def clean_crime_data(df: pd.DataFrame) -> pd.DataFrame:
     return df_clean
 
 
-def main():
-    """Main function to clean all datasets"""
-    logger.info("Starting data cleaning process")
+# Read hints for the raw files, by file stem: (column dtypes, timestamp
+# columns). Columns missing from a particular download are skipped.
+RAW_SCHEMAS = {
+    '311_raw': (
+        {'sr_number': 'string', 'service_request_number': 'string',
+         'latitude': 'float64', 'longitude': 'float64'},
+        ['created_date', 'updated_date', 'closed_date', 'sr_date'],
+    ),
+    'cta_raw': (
+        {'route': 'string', 'station_id': 'string'},
+        ['date', 'service_date'],
+    ),
+    'traffic_raw': (
+        {'segment_id': 'string', 'speed': 'float64'},
+        ['time'],
+    ),
+    'crime_raw': (
+        {'case_number': 'string', 'latitude': 'float64', 'longitude': 'float64'},
+        ['date', 'updated_on'],
+    ),
+}
+
+
+def _raw_read_hints(path: Path, filename: str):
+    """Dtype and timestamp hints from RAW_SCHEMAS for the columns present in path"""
+    dtypes, date_cols = RAW_SCHEMAS.get(Path(filename).stem, ({}, []))
+    
+    # Only hint columns present in this download; parse_dates rejects unknown ones
+    columns = set(pd.read_csv(path, nrows=0).columns)
+    dtypes = {col: dtype for col, dtype in dtypes.items() if col in columns}
+    date_cols = [col for col in date_cols if col in columns]
+    return dtypes, date_cols
+
+
+def read_raw_csv(filename: str) -> pd.DataFrame:
+    """
+    Load a raw collector CSV with the multithreaded pyarrow reader
+    
+    Args:
+        filename: File name under data/raw (its stem a key of RAW_SCHEMAS)
+    
+    Returns:
+        DataFrame with known columns typed and timestamps parsed
+    """
+    path = PROJECT_ROOT / "data" / "raw" / filename
+    dtypes, date_cols = _raw_read_hints(path, filename)
     
-    # Load raw data
     try:
-        df_311 = pd.read_csv(PROJECT_ROOT / "data" / "raw" / "311_raw.csv")
-        logger.info(f"Loaded 311 data: {len(df_311)} records")
-    except FileNotFoundError:
-        logger.warning("311_raw.csv not found. Skipping 311 data cleaning.")
-        df_311 = None
+        return pd.read_csv(path, engine='pyarrow', dtype=dtypes, parse_dates=date_cols)
+    except (ValueError, pd.errors.ParserError) as e:
+        # Arrow is strict about malformed rows and mixed values; the C
+        # parser is more forgiving and normalize_timestamps parses later
+        logger.warning(f"pyarrow could not read {filename} ({e}); using the default parser")
+        return pd.read_csv(path, low_memory=False)
+
+
+def iter_raw_csv(filename: str, chunksize: int):
+    """
+    Read a raw collector CSV in chunks of rows, every column as text
     
+    Nothing is inferred per chunk: the C parser would otherwise pick a
+    column's dtype from the values in each chunk. iter_raw_data types the
+    chunks with casts chosen for the whole file, as for Parquet.
+    
+    Args:
+        filename: File name under data/raw
+        chunksize: Rows per chunk
+    
+    Returns:
+        Iterator of Arrow tables of string columns
+    """
+    path = PROJECT_ROOT / "data" / "raw" / filename
+    # The pyarrow engine has no chunked mode, so use the C parser
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, low_memory=False):
+        schema = pa.schema([(str(col), pa.string()) for col in chunk.columns])
+        yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+
+def raw_data_path(name: str) -> Path:
+    """
+    Locate a raw dataset, preferring the Parquet file the collectors write
+    
+    A CSV newer than the Parquet file (e.g. dropped in by hand) wins.
+    
+    Args:
+        name: File stem under data/raw (e.g. '311_raw')
+    
+    Returns:
+        Path to the .parquet or .csv file (the .csv path if neither exists)
+    """
+    parquet_path = PROJECT_ROOT / "data" / "raw" / f"{name}.parquet"
+    csv_path = parquet_path.with_suffix('.csv')
+    if parquet_path.exists() and (not csv_path.exists()
+                                  or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        return parquet_path
+    return csv_path
+
+
+def _raw_cast_targets(name: str, dtypes: dict, date_cols: list) -> tuple:
+    """Arrow types to try, in order, for a raw string column"""
+    if name in date_cols:
+        return (pa.timestamp('ns'),)
+    if dtypes.get(name) == 'float64':
+        return (pa.float64(),)
+    return (pa.int64(), pa.float64(), pa.bool_())
+
+
+def _is_text_field(field: pa.Field) -> bool:
+    return pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+
+
+def _casts_cleanly(column, target: pa.DataType) -> bool:
     try:
-        df_cta = pd.read_csv(PROJECT_ROOT / "data" / "raw" / "cta_raw.csv")
-        logger.info(f"Loaded CTA data: {len(df_cta)} records")
-    except FileNotFoundError:
-        logger.warning("cta_raw.csv not found. Skipping CTA data cleaning.")
-        df_cta = None
+        column.cast(target)
+        return True
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+
+
+def _typed_raw_table(table: pa.Table, filename: str,
+                     column_types: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Convert a raw Parquet table to pandas with the dtypes a CSV read would give
+    
+    Socrata returns numbers as JSON strings, so string columns are cast to
+    int64, float64 or bool where every value allows it, then the RAW_SCHEMAS
+    dtype hints are applied. RAW_SCHEMAS timestamp columns are parsed by
+    Arrow's ISO 8601 cast, as parse_dates does for CSV; a column with an
+    unparseable value is left to normalize_timestamps.
     
+    Args:
+        table: Raw table
+        filename: File name under data/raw (its stem a key of RAW_SCHEMAS)
+        column_types: Casts from _raw_column_types to use instead of choosing
+            them from this table's values, for one chunk of a larger file
+    """
+    dtypes, date_cols = RAW_SCHEMAS.get(Path(filename).stem, ({}, []))
+    dtypes = {col: dtype for col, dtype in dtypes.items() if col in table.column_names}
+    # The pandas metadata the collectors wrote would restore the string dtypes
+    table = table.replace_schema_metadata(None)
+    
+    if column_types is not None:
+        for name, targets in column_types.items():
+            i = table.schema.get_field_index(name)
+            column = table.column(i)
+            for target in targets:
+                column = column.cast(target)
+            table = table.set_column(i, name, column)
+        # The numeric hints were already folded into column_types
+        dtypes = {col: dtype for col, dtype in dtypes.items() if dtype == 'string'}
+    else:
+        for i, field in enumerate(table.schema):
+            if dtypes.get(field.name) == 'string' or not _is_text_field(field):
+                continue
+            for target in _raw_cast_targets(field.name, dtypes, date_cols):
+                if _casts_cleanly(table.column(i), target):
+                    table = table.set_column(i, field.name, table.column(i).cast(target))
+                    break
+    
+    df = table.to_pandas()
     try:
-        df_traffic = pd.read_csv(PROJECT_ROOT / "data" / "raw" / "traffic_raw.csv")
-        logger.info(f"Loaded Traffic data: {len(df_traffic)} records")
-    except FileNotFoundError:
-        logger.warning("traffic_raw.csv not found. Skipping Traffic data cleaning.")
-        df_traffic = None
+        return df.astype(dtypes)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Could not apply dtype hints to {filename} ({e})")
+        return df
+
+
+def read_raw_parquet(filename: str) -> pd.DataFrame:
+    """
+    Load a raw collector Parquet file
     
+    Args:
+        filename: File name under data/raw (its stem a key of RAW_SCHEMAS)
+    
+    Returns:
+        DataFrame with the dtypes read_raw_csv would give
+    """
+    return _typed_raw_table(pq.read_table(PROJECT_ROOT / "data" / "raw" / filename), filename)
+
+
+def read_raw_data(name: str) -> pd.DataFrame:
+    """
+    Load a raw dataset by file stem from Parquet or CSV (see raw_data_path),
+    with text columns as Arrow-backed strings (see use_arrow_strings)
+    """
+    path = raw_data_path(name)
+    if path.suffix == '.parquet':
+        return use_arrow_strings(read_raw_parquet(path.name))
+    return use_arrow_strings(read_raw_csv(path.name))
+
+
+def _iter_raw_tables(path: Path, chunksize: int):
+    """Untyped Arrow tables of chunksize rows from a raw Parquet or CSV file"""
+    if path.suffix == '.csv':
+        return iter_raw_csv(path.name, chunksize)
+    return (pa.Table.from_batches([batch])
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize))
+
+
+def _raw_column_types(path: Path, chunksize: int) -> dict:
+    """
+    Choose the cast of each text column of a raw file over the whole file
+    
+    A column gets the first cast _typed_raw_table would try that works for
+    every chunk. Whole numbers with a missing value anywhere become float64
+    and true/false flags with one become 1.0/0.0 floats, so a chunk without
+    gaps is typed like one with them.
+    
+    Returns:
+        dict mapping column name to the Arrow types to cast it through
+    """
+    dtypes, date_cols = RAW_SCHEMAS.get(path.stem, ({}, []))
+    candidates = {}
+    with_nulls = set()
+    for table in _iter_raw_tables(path, chunksize):
+        for field in table.schema:
+            if dtypes.get(field.name) == 'string' or not _is_text_field(field):
+                continue
+            column = table.column(field.name)
+            if column.null_count:
+                with_nulls.add(field.name)
+            remaining = candidates.get(field.name, _raw_cast_targets(field.name, dtypes, date_cols))
+            candidates[field.name] = tuple(target for target in remaining
+                                           if _casts_cleanly(column, target))
+    
+    column_types = {}
+    for name, remaining in candidates.items():
+        if not remaining:
+            continue
+        target = remaining[0]
+        if name in with_nulls and target == pa.int64():
+            column_types[name] = (pa.float64(),)
+        elif name in with_nulls and target == pa.bool_():
+            column_types[name] = (pa.bool_(), pa.float64())
+        else:
+            column_types[name] = (target,)
+    return column_types
+
+
+def iter_raw_data(name: str, chunksize: int):
+    """
+    Read a raw dataset by file stem in chunks of rows from Parquet or CSV
+    
+    The file is read twice: once to fix each column's dtype for the whole
+    file (see _raw_column_types), then chunk by chunk with those dtypes, so
+    a value late in the file cannot change a column's type between chunks.
+    """
+    path = raw_data_path(name)
+    column_types = _raw_column_types(path, chunksize)
+    chunks = (_typed_raw_table(table, path.name, column_types)
+              for table in _iter_raw_tables(path, chunksize))
+    return map(use_arrow_strings, chunks)
+
+
+# Raw files above this size are cleaned chunk by chunk, so peak memory is
+# bounded by the chunk size rather than the download size
+STREAM_MIN_BYTES = 1 << 30
+STREAM_CHUNK_ROWS = 500_000
+
+# (log label, raw file stem, cleaner, cleaned file, dedup key columns) for each
+# independent dataset. The key columns mirror the cleaner's duplicate check:
+# if the first one is missing the whole row is the key.
+DATASETS = (
+    ('311', '311_raw', clean_311_data, '311_data.parquet',
+     ('service_request_number',)),
+    ('CTA', 'cta_raw', clean_cta_data, 'cta_ridership.parquet',
+     ('date', 'mode', 'station_id', 'route')),
+    ('Traffic', 'traffic_raw', clean_traffic_data, 'traffic_data.parquet', ()),
+    ('crime', 'crime_raw', clean_crime_data, 'crime_data.parquet',
+     ('case_number',)),
+)
+
+
+def _drop_seen_rows(df: pd.DataFrame, dedup_keys: tuple, seen: np.ndarray):
+    """
+    Drop rows whose key was already written from an earlier chunk
+    
+    Keys are compared as 64-bit row hashes, so only the sorted hashes of
+    written rows are kept in memory.
+    
+    Returns:
+        tuple: (filtered DataFrame, updated sorted array of seen hashes)
+    """
+    if dedup_keys and dedup_keys[0] in df.columns:
+        key_cols = [col for col in dedup_keys if col in df.columns]
+    else:
+        key_cols = list(df.columns)
+    
+    hashes = pd.util.hash_pandas_object(df[key_cols], index=False).to_numpy()
+    new_rows = ~np.isin(hashes, seen, assume_unique=False)
+    if not new_rows.all():
+        logger.info(f"Removed {int((~new_rows).sum())} duplicates of rows in earlier chunks")
+        df = df[new_rows]
+    return df, np.union1d(seen, hashes[new_rows])
+
+
+def _with_wide_dictionaries(schema: pa.Schema) -> pa.Schema:
+    """
+    Give category (dictionary) columns int32 indices
+    
+    pandas stores category codes as int8 or int16 depending on how many
+    categories a chunk has, which need not match between chunks.
+    """
+    fields = [field.with_type(pa.dictionary(pa.int32(), field.type.value_type, field.type.ordered))
+              if pa.types.is_dictionary(field.type) else field
+              for field in schema]
+    return pa.schema(fields, metadata=schema.metadata)
+
+
+def _clean_dataset_in_chunks(label: str, raw_name: str, cleaner, output_path: Path,
+                             dedup_keys: tuple) -> int:
+    """
+    Clean a large raw file chunk by chunk, appending row groups to one Parquet file
+    
+    Row groups go to a temporary file that replaces output_path only once
+    every chunk is written, so a failure never leaves a truncated file for
+    cleaned_data_path to pick up.
+    
+    Returns:
+        Number of cleaned records saved
+    """
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    writer = None
+    seen = np.empty(0, dtype=np.uint64)
+    total_raw = total_clean = 0
+    try:
+        for chunk in iter_raw_data(raw_name, STREAM_CHUNK_ROWS):
+            total_raw += len(chunk)
+            df_clean, seen = _drop_seen_rows(cleaner(chunk, streaming=True), dedup_keys, seen)
+            if df_clean.empty:
+                continue
+            table = pa.Table.from_pandas(df_clean, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, _with_wide_dictionaries(table.schema),
+                                          compression='snappy')
+            # Column types are fixed for the whole file; the cast only
+            # evens out category index widths, timestamp units and the like
+            writer.write_table(table.cast(writer.schema))
+            total_clean += len(df_clean)
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    
+    if writer is not None:
+        writer.close()
+        tmp_path.replace(output_path)
+    
+    logger.info(f"Loaded {label} data: {total_raw} records")
+    if total_clean:
+        logger.info(f"Saved cleaned {label} data: {total_clean} records")
+    return total_clean
+
+
+def clean_dataset(label: str, raw_name: str, cleaner, output_name: str,
+                  dedup_keys: tuple = ()) -> int:
+    """
+    Load, clean and save one raw dataset
+    
+    Args:
+        label: Dataset name used in log messages
+        raw_name: File stem under data/raw (Parquet or CSV)
+        cleaner: Cleaning function applied to the loaded DataFrame
+        output_name: File name under data/cleaned
+        dedup_keys: Duplicate key columns, used across chunks of large files
+    
+    Returns:
+        Number of cleaned records saved (0 if the dataset was skipped)
+    """
+    output_path = PROJECT_ROOT / "data" / "cleaned" / output_name
+    raw_path = raw_data_path(raw_name)
     try:
-        df_crime = pd.read_csv(PROJECT_ROOT / "data" / "raw" / "crime_raw.csv")
-        logger.info(f"Loaded crime data: {len(df_crime)} records")
+        raw_size = raw_path.stat().st_size
     except FileNotFoundError:
-        logger.warning("crime_raw.csv not found. Skipping crime data cleaning.")
-        df_crime = None
+        logger.warning(f"{raw_path.name} not found. Skipping {label} data cleaning.")
+        return 0
     
-    # Clean each dataset
-    if df_311 is not None and not df_311.empty:
-        df_311_clean = clean_311_data(df_311)
-        output_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    if raw_size > STREAM_MIN_BYTES:
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_311_clean.to_csv(output_path, index=False)
-        logger.info(f"Saved cleaned 311 data: {len(df_311_clean)} records")
+        return _clean_dataset_in_chunks(label, raw_name, cleaner, output_path, dedup_keys)
     
-    if df_cta is not None and not df_cta.empty:
-        df_cta_clean = clean_cta_data(df_cta)
-        output_path = PROJECT_ROOT / "data" / "cleaned" / "cta_ridership.csv"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_cta_clean.to_csv(output_path, index=False)
-        logger.info(f"Saved cleaned CTA data: {len(df_cta_clean)} records")
+    df = read_raw_data(raw_name)
+    logger.info(f"Loaded {label} data: {len(df)} records")
     
-    if df_traffic is not None and not df_traffic.empty:
-        df_traffic_clean = clean_traffic_data(df_traffic)
-        output_path = PROJECT_ROOT / "data" / "cleaned" / "traffic_data.csv"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_traffic_clean.to_csv(output_path, index=False)
-        logger.info(f"Saved cleaned Traffic data: {len(df_traffic_clean)} records")
+    if df.empty:
+        return 0
     
-    if df_crime is not None and not df_crime.empty:
-        df_crime_clean = clean_crime_data(df_crime)
-        output_path = PROJECT_ROOT / "data" / "cleaned" / "crime_data.csv"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_crime_clean.to_csv(output_path, index=False)
-        logger.info(f"Saved cleaned crime data: {len(df_crime_clean)} records")
+    df_clean = cleaner(df)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Columnar, dictionary-encoded and typed, so readers skip re-parsing text
+    df_clean.to_parquet(output_path, engine='pyarrow', compression='snappy', index=False)
+    logger.info(f"Saved cleaned {label} data: {len(df_clean)} records")
+    return len(df_clean)
+
+
+def main(geocode: Optional[bool] = None):
+    """
+    Main function to clean all datasets
+    
+    Args:
+        geocode: Geocode 311 addresses missing coordinates (see
+            clean_311_data); defaults to the GEOCODE_311 environment
+            variable being set to 1, so pipeline runs can opt in
+    """
+    logger.info("Starting data cleaning process")
+    if geocode is None:
+        geocode = os.environ.get('GEOCODE_311') == '1'
+    
+    datasets = DATASETS
+    if geocode:
+        datasets = tuple(
+            (label, raw_name, partial(cleaner, geocode=True), *rest) if cleaner is clean_311_data
+            else (label, raw_name, cleaner, *rest)
+            for label, raw_name, cleaner, *rest in DATASETS
+        )
+    
+    # The datasets share no state, so each worker reads, cleans and writes its own
+    with ProcessPoolExecutor(max_workers=len(datasets)) as pool:
+        futures = {pool.submit(clean_dataset, *dataset): dataset[0] for dataset in datasets}
+        for future in as_completed(futures):
+            future.result()
     
     logger.info("Data cleaning complete")
 
 
 if __name__ == "__main__":
     main()
-
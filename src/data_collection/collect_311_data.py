@@ -3,18 +3,26 @@ Chicago 311 Service Requests Data Collection
 Collects transit-related complaints from Chicago 311 API
 """
 
-import requests
 import pandas as pd
-import time
+import pyarrow as pa
+import pyarrow.compute as pc
 import logging
-import os
+import sys
+import re
+import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List
 from pathlib import Path
 
 # Get project root directory (parent of src directory)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Make the shared Socrata client importable when this file runs as a script
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from data_collection.socrata import fetch_records
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +30,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ()
+
+# Unique id of a 311 record; repeats across pages are skipped
+RECORD_ID_FIELD = 'sr_number'
+
 # Chicago 311 API endpoint (Socrata Open Data API)
 BASE_URL = "https://data.cityofchicago.org/resource/v6vf-nfxy.json"
 
@@ -38,6 +52,14 @@ TRANSIT_KEYWORDS = [
     'streetlight'
 ]
 
+# Alternation of the keywords, built once; matched case-insensitively by
+# Arrow's RE2 engine (see _matches_transit_pattern)
+TRANSIT_PATTERN = '|'.join(map(re.escape, TRANSIT_KEYWORDS))
+
+# The same keyword match as a SoQL condition on the request type, so the API
+# only returns transit-related requests
+TRANSIT_WHERE = " OR ".join(f"upper(sr_type) like '%{kw.upper()}%'" for kw in TRANSIT_KEYWORDS)
+
 # Service request types that are transit-related
 TRANSIT_SERVICE_TYPES = [
     'Street Light Out',
@@ -50,6 +72,43 @@ TRANSIT_SERVICE_TYPES = [
 ]
 
 
+def fetch_311_data_between(start_date: datetime, end_date: datetime, limit: int = 100000,
+                           use_keyword_filter: bool = True) -> pd.DataFrame:
+    """
+    Fetch 311 service requests created over a range of calendar days
+    
+    Args:
+        start_date: First day to include
+        end_date: Last day to include (the whole day)
+        limit: Maximum number of records to fetch
+        use_keyword_filter: Only fetch requests whose type matches TRANSIT_KEYWORDS
+    
+    Returns:
+        DataFrame with 311 service request data
+    """
+    # Format dates for API query
+    start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
+    end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
+    
+    logger.info(f"Fetching 311 data from {start_date_str} to {end_date_str}")
+    
+    where = f"created_date >= '{start_date_str}' AND created_date <= '{end_date_str}'"
+    if use_keyword_filter:
+        where += f" AND ({TRANSIT_WHERE})"
+    
+    # Many requests share a timestamp; the row id breaks ties so offset pages are disjoint
+    df = fetch_records(BASE_URL, '311', where, 'created_date DESC, :id', limit,
+                       id_field=RECORD_ID_FIELD)
+    
+    if df.empty:
+        logger.warning("No records fetched")
+        return pd.DataFrame()
+    
+    logger.info(f"Total records fetched: {len(df)}")
+    
+    return df
+
+
 def fetch_311_data(
     limit: int = 50000,
     days_back: int = 90,
@@ -63,6 +122,7 @@ def fetch_311_data(
         limit: Maximum number of records to fetch
         days_back: Number of days to look back from today
         service_types: List of service type names to filter (optional)
+        use_keyword_filter: Only fetch requests whose type matches TRANSIT_KEYWORDS
     
     Returns:
         DataFrame with 311 service request data
@@ -74,72 +134,26 @@ def fetch_311_data(
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days_back)
     
-    # Format dates for API query
-    start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
-    end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
-    
-    logger.info(f"Fetching 311 data from {start_date_str} to {end_date_str}")
-    
-    all_records = []
-    offset = 0
-    batch_size = 5000  # Socrata API limit per request
-    
-    while offset < limit:
-        try:
-            # Build query parameters - start simple
-            params = {
-                '$limit': min(batch_size, limit - offset),
-                '$offset': offset,
-                '$where': f"created_date >= '{start_date_str}' AND created_date <= '{end_date_str}'",
-                '$order': 'created_date DESC'
-            }
-            
-            # Add service type filter if provided
-            # Use keyword-based filtering instead of exact service types
-            if use_keyword_filter and service_types:
-                # Filter by keywords in service_request_type
-                keywords = ['street', 'light', 'pothole', 'traffic', 'sidewalk', 'alley']
-                keyword_filter = " OR ".join([f"service_request_type like '%{kw}%'" for kw in keywords])
-                params['$where'] += f" AND ({keyword_filter})"
-            
-            logger.info(f"Fetching batch: offset={offset}, limit={params['$limit']}")
-            
-            response = requests.get(BASE_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                logger.info("No more records to fetch")
-                break
-            
-            all_records.extend(data)
-            logger.info(f"Fetched {len(data)} records (total: {len(all_records)})")
-            
-            # If we got fewer records than requested, we've reached the end
-            if len(data) < batch_size:
-                break
-            
-            offset += len(data)
-            
-            # Rate limiting - be respectful to the API
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            break
-    
-    if not all_records:
-        logger.warning("No records fetched")
-        return pd.DataFrame()
-    
-    df = pd.DataFrame(all_records)
-    logger.info(f"Total records fetched: {len(df)}")
+    # Use keyword-based filtering instead of exact service types
+    return fetch_311_data_between(start_date, end_date, limit,
+                                  use_keyword_filter=use_keyword_filter and bool(service_types))
+
+
+def _matches_transit_pattern(values: pd.Series) -> np.ndarray:
+    """
+    Boolean mask of values containing a transit keyword (case-insensitive)
     
-    return df
+    Runs TRANSIT_PATTERN through Arrow's RE2-based match_substring_regex,
+    a linear-time automaton, instead of Python's backtracking re, which
+    str.contains uses on object columns. Missing values never match.
+    """
+    try:
+        matches = pc.match_substring_regex(pa.array(values, from_pandas=True),
+                                           TRANSIT_PATTERN, ignore_case=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Column mixing strings with other JSON values
+        return values.str.contains(TRANSIT_PATTERN, case=False, na=False).to_numpy(dtype=bool)
+    return matches.fill_null(False).to_numpy(zero_copy_only=False)
 
 
 def filter_transit_related(df: pd.DataFrame) -> pd.DataFrame:
@@ -155,111 +169,47 @@ def filter_transit_related(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
     
-    # Create a copy to avoid SettingWithCopyWarning
-    df_filtered = df.copy()
-    
-    # Filter by service request type
-    if 'service_request_type' in df_filtered.columns:
-        transit_mask = df_filtered['service_request_type'].str.contains(
-            '|'.join(TRANSIT_KEYWORDS),
-            case=False,
-            na=False
-        )
-        df_filtered = df_filtered[transit_mask]
+    # Keep rows whose request type or description mentions a keyword;
+    # indexing once with the combined mask already returns a new frame
+    transit_mask = None
+    for col in ('sr_type', 'service_request_type', 'description'):
+        if col in df.columns:
+            col_mask = _matches_transit_pattern(df[col])
+            transit_mask = col_mask if transit_mask is None else transit_mask | col_mask
     
-    # Also filter by description if available
-    if 'description' in df_filtered.columns:
-        desc_mask = df_filtered['description'].str.contains(
-            '|'.join(TRANSIT_KEYWORDS),
-            case=False,
-            na=False
-        )
-        df_filtered = pd.concat([df_filtered, df[desc_mask]]).drop_duplicates()
+    df_filtered = df[transit_mask] if transit_mask is not None else df.copy()
     
     logger.info(f"Filtered to {len(df_filtered)} transit-related records")
     
     return df_filtered
 
 
-def fetch_311_data_for_year(year: int = 2025, limit: int = 100000) -> pd.DataFrame:
+def fetch_311_data_for_year(year: int = 2025, limit: int = 100000,
+                            use_keyword_filter: bool = True) -> pd.DataFrame:
     """
     Fetch 311 data for a specific year
     
     Args:
         year: Year to fetch data for (default: 2025)
         limit: Maximum number of records to fetch
+        use_keyword_filter: Only fetch requests whose type matches TRANSIT_KEYWORDS
     
     Returns:
         DataFrame with 311 service request data
     """
     logger.info(f"Fetching 311 data for year {year}")
-    
-    # Calculate date range for the entire year
-    start_date = datetime(year, 1, 1)
-    end_date = datetime(year, 12, 31, 23, 59, 59)
-    
-    # Format dates for API query
-    start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
-    end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
-    
-    logger.info(f"Fetching 311 data from {start_date_str} to {end_date_str}")
-    
-    all_records = []
-    offset = 0
-    batch_size = 5000
-    
-    while offset < limit:
-        try:
-            params = {
-                '$limit': min(batch_size, limit - offset),
-                '$offset': offset,
-                '$where': f"created_date >= '{start_date_str}' AND created_date <= '{end_date_str}'",
-                '$order': 'created_date DESC'
-            }
-            
-            logger.info(f"Fetching batch: offset={offset}, limit={params['$limit']}")
-            
-            response = requests.get(BASE_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                logger.info("No more records to fetch")
-                break
-            
-            all_records.extend(data)
-            logger.info(f"Fetched {len(data)} records (total: {len(all_records)})")
-            
-            if len(data) < batch_size:
-                break
-            
-            offset += len(data)
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            break
-    
-    if not all_records:
-        logger.warning("No records fetched")
-        return pd.DataFrame()
-    
-    df = pd.DataFrame(all_records)
-    logger.info(f"Total records fetched: {len(df)}")
-    
-    return df
+    return fetch_311_data_between(datetime(year, 1, 1), datetime(year, 12, 31), limit,
+                                  use_keyword_filter=use_keyword_filter)
 
 
 def main():
     """Main function to collect and save 311 data"""
     logger.info("Starting 311 data collection")
     
-    # Fetch data for 2025
+    # Fetch transit-related requests for 2025; the keyword filter runs
+    # server-side, so only matching rows are downloaded
     df = fetch_311_data_for_year(year=2025, limit=100000)
+    keyword_filtered = True
     
     if df.empty:
         logger.warning("No 2025 data found. Trying fallback method...")
@@ -271,22 +221,23 @@ def main():
         if df.empty:
             logger.info("No data with keyword filter. Trying without service type filter...")
             df = fetch_311_data(limit=100000, days_back=365, use_keyword_filter=False)
+            keyword_filtered = False
     
     if df.empty:
         logger.warning("No data collected. Exiting.")
         return
     
-    # Filter for transit-related complaints
-    df_transit = filter_transit_related(df)
+    # Filter for transit-related complaints unless the API already did
+    df_transit = df if keyword_filtered else filter_transit_related(df)
     
     if df_transit.empty:
         logger.warning("No transit-related data found. Saving all data.")
         df_transit = df
     
     # Save raw data
-    output_path = PROJECT_ROOT / "data" / "raw" / "311_raw.csv"
+    output_path = PROJECT_ROOT / "data" / "raw" / "311_raw.parquet"
     output_path.parent.mkdir(parents=True, exist_ok=True)  # Create directory if needed
-    df_transit.to_csv(output_path, index=False)
+    df_transit.to_parquet(output_path, compression='zstd', index=False)
     logger.info(f"Saved {len(df_transit)} records to {output_path}")
     
     # Print summary
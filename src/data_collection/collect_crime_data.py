@@ -3,16 +3,21 @@ Chicago Crime Data Collection
 Downloads crime data from data.cityofchicago.org
 """
 
-import requests
 import pandas as pd
 import logging
-import time
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Get project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Make the shared Socrata client importable when this file runs as a script
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from data_collection.socrata import fetch_records
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,80 +25,64 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ()
+
+# Unique id of a crime record; repeats across pages are skipped
+RECORD_ID_FIELD = 'case_number'
+
 # Chicago Crime API endpoint
 CRIME_URL = "https://data.cityofchicago.org/resource/ijzp-q8t2.json"
 
 
-def fetch_crime_data(days_back: int = 90, limit: int = 50000) -> pd.DataFrame:
+def fetch_crime_data_between(start_date: datetime, end_date: datetime,
+                             limit: int = 100000) -> pd.DataFrame:
     """
-    Fetch Chicago crime data
+    Fetch Chicago crime data for a range of calendar days
     
     Args:
-        days_back: Number of days to look back from today
+        start_date: First day to include
+        end_date: Last day to include (the whole day)
         limit: Maximum number of records to fetch
     
     Returns:
         DataFrame with crime data
     """
-    logger.info("Fetching Chicago crime data")
-    
-    # Calculate date range
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    
     # Format dates for API query
     start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
     end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
     
-    all_records = []
-    offset = 0
-    batch_size = 5000
+    where = f"date >= '{start_date_str}' AND date <= '{end_date_str}'"
+    # Many crimes share a timestamp; the row id breaks ties so offset pages are disjoint
+    df = fetch_records(CRIME_URL, 'crime', where, 'date DESC, :id', limit,
+                       id_field=RECORD_ID_FIELD)
     
-    while offset < limit:
-        try:
-            params = {
-                '$limit': min(batch_size, limit - offset),
-                '$offset': offset,
-                '$where': f"date >= '{start_date_str}' AND date <= '{end_date_str}'",
-                '$order': 'date DESC'
-            }
-            
-            logger.info(f"Fetching crime data: offset={offset}, limit={params['$limit']}")
-            
-            response = requests.get(CRIME_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                break
-            
-            all_records.extend(data)
-            logger.info(f"Fetched {len(data)} crime records (total: {len(all_records)})")
-            
-            if len(data) < batch_size:
-                break
-            
-            offset += len(data)
-            time.sleep(0.5)  # Rate limiting
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching crime data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            break
-    
-    if not all_records:
+    if df.empty:
         logger.warning("No crime data fetched")
         return pd.DataFrame()
     
-    df = pd.DataFrame(all_records)
-    logger.info(f"Successfully fetched {len(df)} crime records")
+    logger.info(f"Successfully fetched {len(df)} crime records "
+                f"({start_date:%Y-%m-%d} to {end_date:%Y-%m-%d})")
     
     return df
 
 
+def fetch_crime_data(days_back: int = 90, limit: int = 50000) -> pd.DataFrame:
+    """
+    Fetch Chicago crime data
+    
+    Args:
+        days_back: Number of days to look back from today
+        limit: Maximum number of records to fetch
+    
+    Returns:
+        DataFrame with crime data
+    """
+    logger.info("Fetching Chicago crime data")
+    end_date = datetime.now()
+    return fetch_crime_data_between(end_date - timedelta(days=days_back), end_date, limit)
+
+
 def fetch_crime_data_for_year(year: int = 2025, limit: int = 100000) -> pd.DataFrame:
     """
     Fetch crime data for a specific year
@@ -106,62 +95,7 @@ def fetch_crime_data_for_year(year: int = 2025, limit: int = 100000) -> pd.DataF
         DataFrame with crime data
     """
     logger.info(f"Fetching Chicago crime data for year {year}")
-    
-    # Calculate date range for the entire year
-    start_date = datetime(year, 1, 1)
-    end_date = datetime(year, 12, 31, 23, 59, 59)
-    
-    # Format dates for API query
-    start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
-    end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
-    
-    all_records = []
-    offset = 0
-    batch_size = 5000
-    
-    while offset < limit:
-        try:
-            params = {
-                '$limit': min(batch_size, limit - offset),
-                '$offset': offset,
-                '$where': f"date >= '{start_date_str}' AND date <= '{end_date_str}'",
-                '$order': 'date DESC'
-            }
-            
-            logger.info(f"Fetching crime data: offset={offset}, limit={params['$limit']}")
-            
-            response = requests.get(CRIME_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                break
-            
-            all_records.extend(data)
-            logger.info(f"Fetched {len(data)} crime records (total: {len(all_records)})")
-            
-            if len(data) < batch_size:
-                break
-            
-            offset += len(data)
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching crime data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            break
-    
-    if not all_records:
-        logger.warning("No crime data fetched")
-        return pd.DataFrame()
-    
-    df = pd.DataFrame(all_records)
-    logger.info(f"Successfully fetched {len(df)} crime records for {year}")
-    
-    return df
+    return fetch_crime_data_between(datetime(year, 1, 1), datetime(year, 12, 31), limit)
 
 
 def main():
@@ -181,9 +115,9 @@ def main():
         return
     
     # Save raw data
-    output_path = PROJECT_ROOT / "data" / "raw" / "crime_raw.csv"
+    output_path = PROJECT_ROOT / "data" / "raw" / "crime_raw.parquet"
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(output_path, index=False)
+    df.to_parquet(output_path, compression='zstd', index=False)
     logger.info(f"Saved {len(df)} records to {output_path}")
     
     # Print summary
@@ -3,11 +3,9 @@ CTA Ridership Data Collection
 Downloads CTA bus and train ridership data from data.cityofchicago.org
 """
 
-import requests
 import pandas as pd
 import logging
-import os
-import time
+import sys
 from datetime import datetime, timedelta
 from typing import Optional
 from pathlib import Path
@@ -15,6 +13,12 @@ from pathlib import Path
 # Get project root directory (parent of src directory)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Make the shared Socrata client importable when this file runs as a script
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from data_collection.socrata import fetch_records
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,6 +26,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ()
+
+# Many rows share a date; the row id breaks ties so offset pages are disjoint
+RIDERSHIP_ORDER = 'date DESC, :id'
+
 # CTA Data Portal endpoints
 CTA_BUS_RIDERSHIP_URL = "https://data.cityofchicago.org/resource/jyb9-n7fm.json"
 # CTA Train (L) Station Entries - correct endpoint
@@ -33,6 +43,17 @@ CTA_TRAIN_ALTERNATIVE_URLS = [
 ]
 
 
+def _fetch_train_records(where: str, limit: int) -> pd.DataFrame:
+    """Fetch train records from the first endpoint that returns any"""
+    for endpoint_url in [CTA_TRAIN_RIDERSHIP_URL] + CTA_TRAIN_ALTERNATIVE_URLS:
+        logger.info(f"Trying train endpoint: {endpoint_url}")
+        df = fetch_records(endpoint_url, 'train', where, RIDERSHIP_ORDER, limit)
+        if not df.empty:
+            logger.info(f"Successfully fetched train data from {endpoint_url}")
+            return df
+    return pd.DataFrame()
+
+
 def fetch_cta_bus_ridership(days_back: int = 90, limit: int = 50000) -> pd.DataFrame:
     """
     Fetch CTA bus ridership data
@@ -54,49 +75,13 @@ def fetch_cta_bus_ridership(days_back: int = 90, limit: int = 50000) -> pd.DataF
     start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
     end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
     
-    all_records = []
-    offset = 0
-    batch_size = 5000
-    
-    while offset < limit:
-        try:
-            params = {
-                '$limit': min(batch_size, limit - offset),
-                '$offset': offset,
-                '$where': f"date >= '{start_date_str}' AND date <= '{end_date_str}'",
-                '$order': 'date DESC'
-            }
-            
-            logger.info(f"Fetching bus data: offset={offset}, limit={params['$limit']}")
-            
-            response = requests.get(CTA_BUS_RIDERSHIP_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                break
-            
-            all_records.extend(data)
-            logger.info(f"Fetched {len(data)} bus records (total: {len(all_records)})")
-            
-            if len(data) < batch_size:
-                break
-            
-            offset += len(data)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching bus data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            break
-    
-    if not all_records:
+    where = f"date >= '{start_date_str}' AND date <= '{end_date_str}'"
+    df = fetch_records(CTA_BUS_RIDERSHIP_URL, 'bus', where, RIDERSHIP_ORDER, limit)
+    
+    if df.empty:
         logger.warning("No bus ridership data fetched")
         return pd.DataFrame()
     
-    df = pd.DataFrame(all_records)
     df['mode'] = 'bus'  # Add mode identifier
     logger.info(f"Total bus records: {len(df)}")
     
@@ -124,66 +109,14 @@ def fetch_cta_train_ridership(days_back: int = 90, limit: int = 50000) -> pd.Dat
     start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
     end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
     
-    all_records = []
-    offset = 0
-    batch_size = 5000
-    
-    # Try primary endpoint first
-    endpoints_to_try = [CTA_TRAIN_RIDERSHIP_URL] + CTA_TRAIN_ALTERNATIVE_URLS
+    # Primary endpoint first, then the alternatives
+    where = f"date >= '{start_date_str}' AND date <= '{end_date_str}'"
+    df = _fetch_train_records(where, limit)
     
-    for endpoint_url in endpoints_to_try:
-        logger.info(f"Trying train endpoint: {endpoint_url}")
-        all_records = []
-        offset = 0
-        
-        while offset < limit:
-            try:
-                params = {
-                    '$limit': min(batch_size, limit - offset),
-                    '$offset': offset,
-                    '$where': f"date >= '{start_date_str}' AND date <= '{end_date_str}'",
-                    '$order': 'date DESC'
-                }
-                
-                logger.info(f"Fetching train data: offset={offset}, limit={params['$limit']}")
-                
-                response = requests.get(endpoint_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if not data:
-                    break
-                
-                all_records.extend(data)
-                logger.info(f"Fetched {len(data)} train records (total: {len(all_records)})")
-                
-                if len(data) < batch_size:
-                    break
-                
-                offset += len(data)
-                
-                # Rate limiting
-                time.sleep(0.5)
-                
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Error fetching train data from {endpoint_url}: {e}")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error with {endpoint_url}: {e}")
-                break
-        
-        # If we got data from this endpoint, use it
-        if all_records:
-            logger.info(f"Successfully fetched train data from {endpoint_url}")
-            break
-    
-    if not all_records:
+    if df.empty:
         logger.warning("No train ridership data fetched from any endpoint")
         return pd.DataFrame()
     
-    df = pd.DataFrame(all_records)
-    
     # Standardize column names to match bus data structure
     # Train data has: station_id, stationname, date, daytype, rides
     # Bus data has: route, date, daytype, rides
@@ -247,103 +180,17 @@ def fetch_cta_data_for_year(year: int = 2025, limit: int = 100000) -> pd.DataFra
     start_date_str = start_date.strftime('%Y-%m-%dT00:00:00.000')
     end_date_str = end_date.strftime('%Y-%m-%dT23:59:59.999')
     
+    where = f"date >= '{start_date_str}' AND date <= '{end_date_str}'"
+    
     # Fetch bus data
     logger.info("Fetching CTA bus ridership data")
-    all_bus_records = []
-    offset = 0
-    batch_size = 5000
-    
-    while offset < limit:
-        try:
-            params = {
-                '$limit': min(batch_size, limit - offset),
-                '$offset': offset,
-                '$where': f"date >= '{start_date_str}' AND date <= '{end_date_str}'",
-                '$order': 'date DESC'
-            }
-            
-            logger.info(f"Fetching bus data: offset={offset}, limit={params['$limit']}")
-            
-            response = requests.get(CTA_BUS_RIDERSHIP_URL, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if not data:
-                break
-            
-            all_bus_records.extend(data)
-            logger.info(f"Fetched {len(data)} bus records (total: {len(all_bus_records)})")
-            
-            if len(data) < batch_size:
-                break
-            
-            offset += len(data)
-            time.sleep(0.5)
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error fetching bus data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            break
-    
-    bus_df = pd.DataFrame(all_bus_records) if all_bus_records else pd.DataFrame()
+    bus_df = fetch_records(CTA_BUS_RIDERSHIP_URL, 'bus', where, RIDERSHIP_ORDER, limit)
     if not bus_df.empty:
         bus_df['mode'] = 'bus'
     
     # Fetch train data
     logger.info("Fetching CTA train ridership data")
-    all_train_records = []
-    offset = 0
-    
-    endpoints_to_try = [CTA_TRAIN_RIDERSHIP_URL] + CTA_TRAIN_ALTERNATIVE_URLS
-    
-    for endpoint_url in endpoints_to_try:
-        logger.info(f"Trying train endpoint: {endpoint_url}")
-        all_train_records = []
-        offset = 0
-        
-        while offset < limit:
-            try:
-                params = {
-                    '$limit': min(batch_size, limit - offset),
-                    '$offset': offset,
-                    '$where': f"date >= '{start_date_str}' AND date <= '{end_date_str}'",
-                    '$order': 'date DESC'
-                }
-                
-                logger.info(f"Fetching train data: offset={offset}, limit={params['$limit']}")
-                
-                response = requests.get(endpoint_url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if not data:
-                    break
-                
-                all_train_records.extend(data)
-                logger.info(f"Fetched {len(data)} train records (total: {len(all_train_records)})")
-                
-                if len(data) < batch_size:
-                    break
-                
-                offset += len(data)
-                time.sleep(0.5)
-                
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Error fetching train data from {endpoint_url}: {e}")
-                break
-            except Exception as e:
-                logger.error(f"Unexpected error with {endpoint_url}: {e}")
-                break
-        
-        if all_train_records:
-            logger.info(f"Successfully fetched train data from {endpoint_url}")
-            break
-    
-    train_df = pd.DataFrame(all_train_records) if all_train_records else pd.DataFrame()
+    train_df = _fetch_train_records(where, limit)
     if not train_df.empty:
         if 'stationname' in train_df.columns and 'route' not in train_df.columns:
             train_df['route'] = train_df['stationname']
@@ -374,9 +221,9 @@ def main():
         return
     
     # Save raw data
-    output_path = PROJECT_ROOT / "data" / "raw" / "cta_raw.csv"
+    output_path = PROJECT_ROOT / "data" / "raw" / "cta_raw.parquet"
     output_path.parent.mkdir(parents=True, exist_ok=True)  # Create directory if needed
-    combined_df.to_csv(output_path, index=False)
+    combined_df.to_parquet(output_path, compression='zstd', index=False)
     logger.info(f"Saved {len(combined_df)} records to {output_path}")
     
     # Print summary
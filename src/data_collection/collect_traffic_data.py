@@ -3,10 +3,9 @@ Traffic Volume Data Collection
 Downloads traffic volume and speed data from data.cityofchicago.org
 """
 
-import requests
 import pandas as pd
 import logging
-import time
+import sys
 from datetime import datetime, timedelta
 from typing import Optional
 from pathlib import Path
@@ -14,6 +13,12 @@ from pathlib import Path
 # Get project root directory
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Make the shared Socrata client importable when this file runs as a script
+if str(PROJECT_ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from data_collection.socrata import fetch_records
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,9 +26,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ()
+
 # Traffic Volume API endpoint - Using Traffic Tracker Historical Congestion Estimates
 TRAFFIC_VOLUME_URL = "https://data.cityofchicago.org/resource/4g9f-3jbs.json"
 
+# Fields clean_data and integrate_data use; the segment street names,
+# coordinates and location points make up most of each full record
+TRAFFIC_COLUMNS = "time,segment_id,speed,bus_count,message_count"
+
 
 def collect_traffic_data(limit: int = 50000, year: Optional[int] = None, max_total: int = 1000000) -> pd.DataFrame:
     """
@@ -49,52 +61,14 @@ def collect_traffic_data(limit: int = 50000, year: Optional[int] = None, max_tot
         start_date = end_date - timedelta(days=90)
         date_filter = f"time between '{start_date.strftime('%Y-%m-%dT00:00:00.000')}' and '{end_date.strftime('%Y-%m-%dT23:59:59.999')}'"
     
-    params = {
-        "$limit": limit,
-        "$order": "time DESC",
-        "$where": date_filter
-    }
-    
-    all_data = []
-    offset = 0
-    
-    while len(all_data) < max_total:
-        current_params = params.copy()
-        current_params["$offset"] = offset
-        # Adjust limit for the last batch to not exceed max_total
-        remaining = max_total - len(all_data)
-        current_params["$limit"] = min(limit, remaining)
-        
-        try:
-            response = requests.get(TRAFFIC_VOLUME_URL, params=current_params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data:
-                logger.info("No more traffic data received from the API.")
-                break
-            
-            all_data.extend(data)
-            logger.info(f"Collected {len(data)} traffic records (total: {len(all_data):,}).")
-            
-            if len(data) < limit or len(all_data) >= max_total:
-                break
-            
-            offset += limit
-            time.sleep(0.5)  # Rate limiting
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Error collecting Traffic data: {e}")
-            break
-        except Exception as e:
-            logger.error(f"An unexpected error occurred during Traffic data collection: {e}")
-            break
+    # Many segments share a time; the row id breaks ties so offset pages are disjoint
+    df = fetch_records(TRAFFIC_VOLUME_URL, 'traffic', date_filter, "time DESC, :id", max_total,
+                       batch_size=limit, select=TRAFFIC_COLUMNS)
     
-    if not all_data:
+    if df.empty:
         logger.warning("No Traffic data collected.")
         return pd.DataFrame()
     
-    df = pd.DataFrame(all_data)
     logger.info(f"Successfully collected a total of {len(df)} Traffic records for {year if year else 'last 90 days'}.")
     return df
 
@@ -104,9 +78,9 @@ def main():
     df_traffic = collect_traffic_data(year=2025, limit=100000, max_total=1000000)  # Fetch for 2025, capped at 1M records (latest first)
     
     if not df_traffic.empty:
-        output_path = PROJECT_ROOT / "data" / "raw" / "traffic_raw.csv"
+        output_path = PROJECT_ROOT / "data" / "raw" / "traffic_raw.parquet"
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        df_traffic.to_csv(output_path, index=False)
+        df_traffic.to_parquet(output_path, compression='zstd', index=False)
         logger.info(f"Traffic raw data saved to {output_path}")
     else:
         logger.warning("No Traffic data to save.")
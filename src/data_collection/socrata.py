@@ -0,0 +1,218 @@
+"""
+Socrata Open Data API Client
+Shared HTTP session and paged downloads for the data.cityofchicago.org collectors
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import pandas as pd
+import pyarrow as pa
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+from pathlib import Path
+
+# Get project root directory (parent of src directory)
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+# Shared session: batches reuse one pooled connection, and throttled (429)
+# or failed (5xx) requests are retried with exponential backoff, waiting
+# as long as a Retry-After header asks. There is no fixed pause between
+# batches; the API's own throttling responses pace the requests.
+# With requests-cache installed, responses are kept in a local SQLite cache
+# for an hour and then revalidated with If-None-Match / If-Modified-Since,
+# so re-runs re-download only pages the portal reports as changed.
+SOCRATA_CACHE_PATH = PROJECT_ROOT / "data" / "cache" / "socrata"
+if REQUESTS_CACHE_AVAILABLE:
+    SESSION = requests_cache.CachedSession(
+        str(SOCRATA_CACHE_PATH),
+        backend='sqlite',
+        cache_control=True,
+        expire_after=3600,
+    )
+else:
+    SESSION = requests.Session()
+SESSION.headers.update({'Accept-Encoding': 'gzip', 'User-Agent': 'cta-eac/1.0'})
+# An app token (free from the data portal) raises Socrata's throttling limits
+if os.environ.get('SOCRATA_APP_TOKEN'):
+    SESSION.headers['X-App-Token'] = os.environ['SOCRATA_APP_TOKEN']
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      respect_retry_after_header=True)
+))
+
+# Batch requests in flight at once per download, within the session's
+# connection pool; 429 responses back off through its retry policy
+FETCH_WORKERS = 4
+
+
+def parse_json(response):
+    """Decode a Socrata JSON response, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def records_to_table(records: list):
+    """
+    Convert one page of Socrata record dicts to an Arrow table
+    
+    Arrow infers one column type from all values instead of pandas' per-cell
+    object inference. Fields a record omits (Socrata drops nulls) become
+    missing values, as with pd.DataFrame(records). A page with a field
+    holding mixed JSON types (e.g. text in one record, object in another)
+    is returned as a pandas DataFrame instead.
+    """
+    try:
+        return pa.Table.from_struct_array(pa.array(records))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pd.DataFrame(records)
+
+
+def pages_to_frame(pages: list) -> pd.DataFrame:
+    """
+    Combine converted pages into one DataFrame
+    
+    Arrow pages are concatenated as tables and converted to pandas once;
+    fields absent from some pages are missing values there.
+    """
+    if not pages:
+        return pd.DataFrame()
+    if all(isinstance(page, pa.Table) for page in pages):
+        try:
+            return pa.concat_tables(pages, promote_options='permissive').to_pandas()
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # A field typed differently across pages
+            pass
+    return pd.concat([page.to_pandas() if isinstance(page, pa.Table) else page
+                      for page in pages], ignore_index=True)
+
+
+def count_records(url: str, where: str) -> int:
+    """Number of records at an endpoint matching a SoQL $where clause"""
+    response = SESSION.get(url, params={'$select': 'count(*)', '$where': where}, timeout=30)
+    response.raise_for_status()
+    # Single row with one count field (named 'count' or 'count_1' by API version)
+    return int(next(iter(parse_json(response)[0].values())))
+
+
+def fetch_page(url: str, label: str, params: Dict):
+    """Fetch one page of records as a table, or None if the request fails"""
+    logger.info(f"Fetching {label} data: offset={params['$offset']}, limit={params['$limit']}")
+    try:
+        response = SESSION.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        # Converted here, so a page waiting its turn holds Arrow columns
+        # rather than record dicts
+        return records_to_table(parse_json(response))
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Error fetching {label} data from {url}: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error with {url}: {e}")
+    return None
+
+
+def _drop_seen_ids(page, id_field: str, seen_ids: set):
+    """Drop records of a page whose id_field value is in seen_ids, adding the others"""
+    is_table = isinstance(page, pa.Table)
+    if id_field not in (page.column_names if is_table else page.columns):
+        return page
+    if is_table:
+        ids = page.column(id_field).to_pylist()
+    else:
+        ids = page[id_field].astype(object).where(page[id_field].notna(), None).tolist()
+    
+    keep = []
+    for record_id in ids:
+        if record_id is not None and record_id in seen_ids:
+            keep.append(False)
+            continue
+        if record_id is not None:
+            seen_ids.add(record_id)
+        keep.append(True)
+    
+    if all(keep):
+        return page
+    return page.filter(pa.array(keep)) if is_table else page[keep]
+
+
+def fetch_records(url: str, label: str, where: str, order: str, limit: int,
+                  batch_size: int = 5000, select: Optional[str] = None,
+                  id_field: Optional[str] = None) -> pd.DataFrame:
+    """
+    Fetch up to limit records from an endpoint, several pages at a time
+    
+    The matching row count is queried first so every page offset is known
+    up front; pages are then requested concurrently over the shared session.
+    A page that still fails after the session's retries is skipped and
+    reported, rather than ending the download there.
+    Each page is converted to Arrow by the worker that fetched it, so record
+    dicts exist for at most one page per worker.
+    
+    Args:
+        url: Socrata resource endpoint
+        label: Dataset name for log messages (e.g. 'crime' or 'bus')
+        where: SoQL $where clause
+        order: SoQL $order clause; end it with the :id row id so records
+            sharing a sort value keep a fixed order and offset pages are disjoint
+        limit: Maximum number of records to fetch
+        batch_size: Records per request (Socrata API limit per request)
+        select: SoQL $select clause (all fields if None)
+        id_field: Unique record id; records whose id was already fetched,
+            e.g. rows that moved between pages while a download ran, are skipped
+    
+    Returns:
+        DataFrame of records in query order (empty if none)
+    """
+    try:
+        total = min(count_records(url, where), limit)
+    except (requests.exceptions.RequestException, ValueError, LookupError) as e:
+        logger.warning(f"Error counting {label} records at {url}: {e}")
+        return pd.DataFrame()
+    
+    batches = [
+        {'$limit': min(batch_size, total - offset), '$offset': offset,
+         '$where': where, '$order': order}
+        for offset in range(0, total, batch_size)
+    ]
+    if select:
+        for params in batches:
+            params['$select'] = select
+    
+    pages = []
+    seen_ids = set()
+    fetched = 0
+    failed = 0
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        for page in executor.map(partial(fetch_page, url, label), batches):
+            if page is None:
+                failed += 1
+                continue
+            if id_field:
+                page = _drop_seen_ids(page, id_field, seen_ids)
+            pages.append(page)
+            fetched += len(page)
+            logger.info(f"Fetched {len(page)} {label} records (total: {fetched:,})")
+    
+    if failed:
+        logger.warning(f"{failed} of {len(batches)} {label} pages failed; their records are missing")
+    return pages_to_frame(pages)
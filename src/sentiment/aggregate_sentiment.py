@@ -19,6 +19,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ('sentiment.sentiment_analyzer',)
+
 
 def aggregate_by_day(df: pd.DataFrame, date_column: str = 'date') -> pd.DataFrame:
     """
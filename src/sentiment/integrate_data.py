@@ -5,6 +5,7 @@ Merges sentiment data with CTA ridership and 311 complaints by date
 
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +20,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ('data_cleaning.clean_data',)
+
+
+def cleaned_data_path(name: str) -> Path:
+    """
+    Locate a cleaned dataset, preferring the Parquet file clean_data writes
+    
+    Args:
+        name: File stem under data/cleaned (e.g. '311_data')
+    
+    Returns:
+        Path to the .parquet file if present, otherwise to the .csv file
+    """
+    parquet_path = PROJECT_ROOT / "data" / "cleaned" / f"{name}.parquet"
+    return parquet_path if parquet_path.exists() else parquet_path.with_suffix('.csv')
+
+
+def read_cleaned_data(path: Path) -> pd.DataFrame:
+    """Read a cleaned dataset saved as Parquet or CSV"""
+    if path.suffix == '.parquet':
+        # One block per column: columns added or dropped later never force a
+        # block consolidation copy, and Arrow buffers are freed as they convert
+        return pq.read_table(path).to_pandas(split_blocks=True, self_destruct=True)
+    return pd.read_csv(path, low_memory=False)
+
 
 def aggregate_cta_by_day(df: pd.DataFrame, date_column: str = 'date') -> pd.DataFrame:
     """
@@ -51,7 +78,7 @@ def aggregate_cta_by_day(df: pd.DataFrame, date_column: str = 'date') -> pd.Data
     
     # Separate by mode if available
     if 'mode' in df.columns:
-        mode_agg = df.groupby(['date_only', 'mode']).agg({
+        mode_agg = df.groupby(['date_only', 'mode'], observed=True).agg({
             'rides': 'sum' if 'rides' in df.columns else 'count'
         }).reset_index()
         
@@ -320,28 +347,28 @@ def integrate_all_data(
     
     # Set default paths if not provided
     if cta_path is None:
-        cta_path = PROJECT_ROOT / "data" / "cleaned" / "cta_ridership.csv"
+        cta_path = cleaned_data_path("cta_ridership")
     else:
         cta_path = Path(cta_path)
     
     if complaints_path is None:
-        complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+        complaints_path = cleaned_data_path("311_data")
     else:
         complaints_path = Path(complaints_path)
     
     if traffic_path is None:
-        traffic_path = PROJECT_ROOT / "data" / "cleaned" / "traffic_data.csv"
+        traffic_path = cleaned_data_path("traffic_data")
     else:
         traffic_path = Path(traffic_path)
     
     if crime_path is None:
-        crime_path = PROJECT_ROOT / "data" / "cleaned" / "crime_data.csv"
+        crime_path = cleaned_data_path("crime_data")
     else:
         crime_path = Path(crime_path)
     
     # Load and aggregate CTA data
     if cta_path.exists():
-        df_cta_raw = pd.read_csv(cta_path)
+        df_cta_raw = read_cleaned_data(cta_path)
         df_cta = aggregate_cta_by_day(df_cta_raw)
         logger.info(f"Loaded CTA data: {len(df_cta)} days")
     else:
@@ -350,7 +377,7 @@ def integrate_all_data(
     
     # Load and aggregate 311 data
     if complaints_path.exists():
-        df_311_raw = pd.read_csv(complaints_path)
+        df_311_raw = read_cleaned_data(complaints_path)
         df_311 = aggregate_311_by_day(df_311_raw)
         logger.info(f"Loaded 311 data: {len(df_311)} days")
     else:
@@ -359,7 +386,7 @@ def integrate_all_data(
     
     # Load and aggregate Traffic data
     if traffic_path.exists():
-        df_traffic_raw = pd.read_csv(traffic_path)
+        df_traffic_raw = read_cleaned_data(traffic_path)
         df_traffic = aggregate_traffic_by_day(df_traffic_raw)
         logger.info(f"Loaded Traffic data: {len(df_traffic)} days")
     else:
@@ -368,7 +395,7 @@ def integrate_all_data(
     
     # Load and aggregate crime data
     if crime_path.exists():
-        df_crime_raw = pd.read_csv(crime_path)
+        df_crime_raw = read_cleaned_data(crime_path)
         df_crime = aggregate_crime_by_day(df_crime_raw)
         logger.info(f"Loaded crime data: {len(df_crime)} days")
     else:
@@ -21,6 +21,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ()
+
 
 class SentimentAnalyzer:
     """Sentiment analyzer using VADER and TextBlob"""
@@ -165,39 +168,36 @@ def analyze_tweets(df: pd.DataFrame, content_column: str = 'content') -> pd.Data
     
     analyzer = SentimentAnalyzer(primary_method='vader')
     
-    # Initialize sentiment columns
-    sentiment_cols = [
+    score_cols = [
         'vader_compound', 'vader_pos', 'vader_neu', 'vader_neg',
         'textblob_polarity', 'textblob_subjectivity',
-        'polarity', 'subjectivity', 'sentiment_category'
+        'polarity', 'subjectivity'
     ]
     
-    for col in sentiment_cols:
-        if col not in df.columns:
-            df[col] = np.nan
-    
-    # Analyze each tweet
+    # Analyze each tweet, collecting scores column by column so each
+    # sentiment column is assigned once instead of cell by cell
     logger.info(f"Analyzing {len(df)} tweets...")
     
-    for idx, row in df.iterrows():
-        text = row[content_column]
-        
+    scores_by_col = {col: [] for col in score_cols}
+    categories = []
+    
+    for i, text in enumerate(df[content_column], start=1):
         # Get sentiment scores
         scores = analyzer.analyze(text)
-        
-        # Update DataFrame
-        for key, value in scores.items():
-            if key in df.columns:
-                df.at[idx, key] = value
+        for col, values in scores_by_col.items():
+            values.append(scores[col])
         
         # Categorize sentiment
-        polarity = scores.get('polarity', 0.0)
-        category = analyzer.categorize_sentiment(polarity)
-        df.at[idx, 'sentiment_category'] = category
+        categories.append(analyzer.categorize_sentiment(scores.get('polarity', 0.0)))
         
         # Progress logging
-        if (idx + 1) % 100 == 0:
-            logger.info(f"Processed {idx + 1}/{len(df)} tweets")
+        if i % 100 == 0:
+            logger.info(f"Processed {i}/{len(df)} tweets")
+    
+    # Update DataFrame
+    for col, values in scores_by_col.items():
+        df[col] = np.array(values, dtype=np.float64)
+    df['sentiment_category'] = categories
     
     logger.info("Sentiment analysis complete")
     
@@ -20,6 +20,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py)
+REQUIRES = ('sentiment.integrate_data',)
+
 
 def calculate_correlations(df: pd.DataFrame) -> Dict[str, Dict[str, float]]:
     """
@@ -36,20 +36,22 @@ from src.analytics.statistical_analysis import (
 )
 from src.analytics.neighborhood_analysis import (
     aggregate_by_neighborhood, aggregate_by_ward, detect_hotspots, compare_neighborhoods,
-    rank_hotspots_by_metric, get_top_hotspots, format_hotspot_description, detect_hotspots_simple
+    rank_hotspots_by_metric, get_top_hotspots, format_hotspot_descriptions,
+    detect_hotspots_simple
 )
 from src.analytics.temporal_analysis import (
-    analyze_day_of_week_patterns, analyze_time_patterns, get_peak_days,
-    format_temporal_insight, get_seasonal_patterns
+    analyze_day_of_week_patterns, analyze_time_patterns,
+    get_peak_days_batch, format_temporal_insights, get_seasonal_patterns
 )
 from src.analytics.simple_correlations import (
-    calculate_simple_correlations, format_correlation_insight,
+    compute_correlations, format_correlation_insight,
     get_top_correlations, get_correlation_summary
 )
 from src.analytics.health_scores import (
     calculate_urban_health_index, get_health_status,
     calculate_route_efficiency_score, calculate_safety_index, calculate_trend_indicator
 )
+from src.sentiment.integrate_data import cleaned_data_path, read_cleaned_data
 from src.visualization.viz_helpers import (
     create_simple_bar_chart, create_insight_card, create_correlation_heatmap,
     create_health_gauge, format_number_for_display, create_multi_metric_bar_chart
@@ -611,10 +613,10 @@ def create_dashboard_layout(df: pd.DataFrame):
     # Get date range from crime data for crime map date picker
     crime_min_date = min_date
     crime_max_date = max_date
-    crime_path = PROJECT_ROOT / "data" / "cleaned" / "crime_data.csv"
+    crime_path = cleaned_data_path("crime_data")
     if crime_path.exists():
         try:
-            df_crimes_temp = pd.read_csv(crime_path, low_memory=False)
+            df_crimes_temp = read_cleaned_data(crime_path)
             if 'date' in df_crimes_temp.columns:
                 df_crimes_temp['date'] = pd.to_datetime(df_crimes_temp['date'], errors='coerce')
                 crime_dates = df_crimes_temp['date'].dropna()
@@ -627,10 +629,10 @@ def create_dashboard_layout(df: pd.DataFrame):
     # Get date range from 311 data for complaint map date picker
     complaint_min_date = min_date
     complaint_max_date = max_date
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     if complaints_path.exists():
         try:
-            df_complaints_temp = pd.read_csv(complaints_path, low_memory=False)
+            df_complaints_temp = read_cleaned_data(complaints_path)
             if 'date' in df_complaints_temp.columns:
                 df_complaints_temp['date'] = pd.to_datetime(df_complaints_temp['date'], errors='coerce')
                 complaint_dates = df_complaints_temp['date'].dropna()
@@ -693,10 +695,10 @@ def create_dashboard_layout(df: pd.DataFrame):
     
     # Get available complaint types from 311 data file
     complaint_types = ['All']
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     if complaints_path.exists():
         try:
-            df_complaints = pd.read_csv(complaints_path, low_memory=False)
+            df_complaints = read_cleaned_data(complaints_path)
             # Check for sr_type or service_request_type column
             type_col = 'sr_type' if 'sr_type' in df_complaints.columns else ('service_request_type' if 'service_request_type' in df_complaints.columns else None)
             if type_col:
@@ -1843,12 +1845,12 @@ def create_dashboard_layout(df: pd.DataFrame):
     [Input("neighborhood-filter", "id")]
 )
 def update_neighborhood_filter(_):
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     options = [{'label': 'All Areas', 'value': 'All'}]
     
     if complaints_path.exists():
         try:
-            df_complaints = pd.read_csv(complaints_path, low_memory=False)
+            df_complaints = read_cleaned_data(complaints_path)
             
             # Add neighborhoods
             if 'community_area' in df_complaints.columns:
@@ -1872,12 +1874,12 @@ def update_neighborhood_filter(_):
     [Input("crime-type-filter", "id")]
 )
 def update_crime_type_filter(_):
-    crime_path = PROJECT_ROOT / "data" / "cleaned" / "crime_data.csv"
+    crime_path = cleaned_data_path("crime_data")
     options = [{'label': 'All Crime Types', 'value': 'All'}]
     
     if crime_path.exists():
         try:
-            df_crimes = pd.read_csv(crime_path, low_memory=False)
+            df_crimes = read_cleaned_data(crime_path)
             
             # Add crime types
             if 'primary_type' in df_crimes.columns:
@@ -2015,16 +2017,25 @@ def update_temporal_patterns(start_date, end_date):
     
     # Generate insights
     insights = []
-    for metric_col in metric_cols:
-        peak_info = get_peak_days(day_patterns, metric_col, day_col='day_name')
-        if peak_info:
-            metric_name = metric_col.replace('_', ' ').title()
-            insights.append(
-                dbc.Alert([
-                    html.Strong(f"{metric_name}: "),
-                    f"Peak: {peak_info['peak_day']}, Low: {peak_info['low_day']}"
-                ], color="info", className="mb-2")
-            )
+    peak_days = get_peak_days_batch(day_patterns, metric_cols, day_col='day_name')
+    found = [col for col in metric_cols if peak_days[col]]
+    infos = [peak_days[col] for col in found]
+    names = [col.replace('_', ' ') for col in found]
+    avg_values = [info['avg_value'] for info in infos]
+    peak_texts = format_temporal_insights([info['peak_day'] for info in infos],
+                                          [info['peak_value'] for info in infos],
+                                          names, avg_values, is_peak=True)
+    low_texts = format_temporal_insights([info['low_day'] for info in infos],
+                                         [info['low_value'] for info in infos],
+                                         names, avg_values, is_peak=False)
+    for metric_col, peak_text, low_text in zip(found, peak_texts, low_texts):
+        metric_name = metric_col.replace('_', ' ').title()
+        insights.append(
+            dbc.Alert([
+                html.Strong(f"{metric_name}: "),
+                f"{peak_text}. {low_text}."
+            ], color="info", className="mb-2")
+        )
     
     insights_div = html.Div(insights) if insights else html.P("No insights available", className="text-muted")
     
@@ -2062,9 +2073,9 @@ def update_correlation_insights(start_date, end_date):
         empty_fig.update_layout(height=500)
         return empty_fig, html.P("Need at least 2 metrics for correlation", className="text-muted")
     
-    corr_results = calculate_simple_correlations(df_filtered, metric_cols)
+    corr_results = compute_correlations(df_filtered, metric_cols)
     
-    if not corr_results or 'correlation_matrix' not in corr_results:
+    if corr_results is None:
         empty_fig = go.Figure()
         empty_fig.add_annotation(text="No correlation data available", xref="paper", yref="paper", x=0.5, y=0.5)
         empty_fig.update_layout(height=500)
@@ -2076,10 +2087,10 @@ def update_correlation_insights(start_date, end_date):
         'total_311_complaints': '311 Complaints',
         'total_crimes': 'Crimes'
     }
-    fig = create_correlation_heatmap(corr_results['correlation_matrix'], labels)
+    fig = create_correlation_heatmap(corr_results.correlation_matrix, labels)
     
     # Create insight cards for top correlations
-    top_corrs = get_top_correlations(df_filtered, n=3, metric_cols=metric_cols)
+    top_corrs = get_top_correlations(corr_results, n=3)
     cards = []
     
     for corr_data in top_corrs:
@@ -2189,7 +2200,7 @@ def update_health_scores(start_date, end_date):
      Input('date-picker', 'end_date')]
 )
 def update_hotspot_analysis(start_date, end_date):
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     
     if not complaints_path.exists():
         empty_fig = go.Figure()
@@ -2198,7 +2209,7 @@ def update_hotspot_analysis(start_date, end_date):
         return empty_fig, html.P("No complaint data available", className="text-muted")
     
     try:
-        df_complaints = pd.read_csv(str(complaints_path), low_memory=False)
+        df_complaints = read_cleaned_data(complaints_path)
         
         # Filter by date if available
         if 'created_date' in df_complaints.columns and start_date and end_date:
@@ -2271,9 +2282,9 @@ def update_hotspot_analysis(start_date, end_date):
         # Create ranking list
         if not hotspot_stats.empty:
             top_hotspots = get_top_hotspots(hotspot_stats, n=10)
+            descriptions = format_hotspot_descriptions(top_hotspots)
             ranking_items = []
-            for idx, row in top_hotspots.iterrows():
-                desc = format_hotspot_description(row)
+            for (idx, row), desc in zip(top_hotspots.iterrows(), descriptions):
                 ranking_items.append(
                     html.Div([
                         html.Strong(f"#{int(row.get('rank', idx+1))} "),
@@ -2580,7 +2591,7 @@ def update_gauge_charts(start_date, end_date):
      Input('complaint-type-filter', 'value')]
 )
 def update_sunburst_chart(start_date, end_date, complaint_type):
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     if not complaints_path.exists():
         fig = go.Figure()
         fig.add_annotation(text="No complaint data available", xref="paper", yref="paper", x=0.5, y=0.5)
@@ -2588,7 +2599,7 @@ def update_sunburst_chart(start_date, end_date, complaint_type):
         return fig
     
     try:
-        df_complaints = pd.read_csv(complaints_path)
+        df_complaints = read_cleaned_data(complaints_path)
         
         # Filter by date if available
         if 'created_date' in df_complaints.columns:
@@ -2604,7 +2615,7 @@ def update_sunburst_chart(start_date, end_date, complaint_type):
         
         # Create hierarchy: Status -> Type
         if 'status' in df_complaints.columns and type_col:
-            hierarchy = df_complaints.groupby(['status', type_col]).size().reset_index(name='count')
+            hierarchy = df_complaints.groupby(['status', type_col], observed=True).size().reset_index(name='count')
             
             # Create sunburst chart
             fig = px.sunburst(
@@ -2639,7 +2650,9 @@ def update_sunburst_chart(start_date, end_date, complaint_type):
             # Fallback: just complaint types
             type_col = 'sr_type' if 'sr_type' in df_complaints.columns else ('service_request_type' if 'service_request_type' in df_complaints.columns else None)
             if type_col:
-                type_counts = df_complaints[type_col].value_counts().reset_index()
+                type_counts = df_complaints[type_col].value_counts()
+                # Categorical types also count labels absent from the filtered rows
+                type_counts = type_counts[type_counts > 0].reset_index()
                 type_counts.columns = ['type', 'count']
                 fig = px.sunburst(
                     type_counts,
@@ -2688,7 +2701,7 @@ def update_sunburst_chart(start_date, end_date, complaint_type):
      Input('neighborhood-filter', 'value')]
 )
 def update_neighborhood_analysis(start_date, end_date, neighborhood):
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     if not complaints_path.exists():
         fig = go.Figure()
         fig.add_annotation(text="No complaint data available", xref="paper", yref="paper", x=0.5, y=0.5)
@@ -2696,7 +2709,7 @@ def update_neighborhood_analysis(start_date, end_date, neighborhood):
         return fig
     
     try:
-        df_complaints = pd.read_csv(complaints_path)
+        df_complaints = read_cleaned_data(complaints_path)
         
         # Filter by date if available
         if 'created_date' in df_complaints.columns:
@@ -2785,7 +2798,7 @@ def update_neighborhood_analysis(start_date, end_date, neighborhood):
 )
 def update_crime_map(start_date, end_date, crime_type):
     """Update crime map based on date and crime type filters"""
-    crime_path = PROJECT_ROOT / "data" / "cleaned" / "crime_data.csv"
+    crime_path = cleaned_data_path("crime_data")
     if not crime_path.exists():
         fig = go.Figure()
         fig.add_annotation(
@@ -2800,7 +2813,7 @@ def update_crime_map(start_date, end_date, crime_type):
         return fig
     
     try:
-        df_crimes = pd.read_csv(str(crime_path), low_memory=False)
+        df_crimes = read_cleaned_data(crime_path)
         if 'latitude' in df_crimes.columns and 'longitude' in df_crimes.columns:
             # Filter valid coordinates within Chicago city limits (excluding Lake Michigan)
             df_map = df_crimes[
@@ -3491,7 +3504,7 @@ def update_dashboard(start_date, end_date, complaint_type):
 )
 def update_complaint_map(start_date, end_date, complaint_type):
     """Update complaint map based on date and complaint type filters"""
-    complaints_path = PROJECT_ROOT / "data" / "cleaned" / "311_data.csv"
+    complaints_path = cleaned_data_path("311_data")
     if not complaints_path.exists():
         fig = go.Figure()
         fig.add_annotation(
@@ -3506,7 +3519,7 @@ def update_complaint_map(start_date, end_date, complaint_type):
         return fig
     
     try:
-        df_complaints = pd.read_csv(str(complaints_path), low_memory=False)
+        df_complaints = read_cleaned_data(complaints_path)
         if 'latitude' in df_complaints.columns and 'longitude' in df_complaints.columns:
             # Filter valid coordinates within Chicago city limits (excluding Lake Michigan)
             df_map = df_complaints[
@@ -24,6 +24,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pipeline steps whose outputs this step reads (see run_pipeline.py).
+# correlation_analysis also writes visualizations/correlation_matrix.csv,
+# so it must finish first for this step's version to be the one kept.
+REQUIRES = ('sentiment.integrate_data', 'visualization.correlation_analysis')
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (12, 6)
@@ -0,0 +1,50 @@
+"""
+Tests for the regression statistics in analytics.statistical_analysis
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analytics.statistical_analysis import linear_regression
+
+
+def test_linear_regression_matches_linregress():
+    x = pd.Series([1.0, 2.0, 3.0, 4.0, 6.0, np.nan])
+    y = pd.Series([2.0, 3.5, 6.5, 8.0, 11.0, 4.0])
+
+    result = linear_regression(x, y)
+    expected = stats.linregress(x[:5], y[:5])
+
+    assert result['slope'] == pytest.approx(expected.slope)
+    assert result['intercept'] == pytest.approx(expected.intercept)
+    assert result['r_value'] == pytest.approx(expected.rvalue)
+    assert result['p_value'] == pytest.approx(expected.pvalue)
+    assert result['std_err'] == pytest.approx(expected.stderr)
+    assert result['n'] == 5
+
+
+def test_linear_regression_constant_y_is_flat_line():
+    x = pd.Series([1.0, 2.0, 3.0, 4.0])
+    y = pd.Series([5.0, 5.0, 5.0, 5.0])
+
+    result = linear_regression(x, y)
+    expected = stats.linregress(x, y)
+
+    assert result['slope'] == expected.slope == 0.0
+    assert result['intercept'] == pytest.approx(expected.intercept) == 5.0
+    assert result['n'] == 4
+
+
+def test_linear_regression_constant_x_raises_value_error():
+    x = pd.Series([3.0, 3.0, 3.0, 3.0])
+    y = pd.Series([1.0, 2.0, 3.0, 4.0])
+
+    with pytest.raises(ValueError):
+        linear_regression(x, y)